@@ -5,18 +5,39 @@ This module defines the public API endpoints for InfraGenie, including
 infrastructure generation and deployment kit download functionality.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import StreamingResponse
+import zipfile
+from typing import Dict, Any, Literal
+from fastapi import APIRouter, HTTPException, Body, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
-from app.core.graph import run_workflow
+from app.core.graph import arun_workflow
 from app.core.state import AgentState
-from app.services.bundler import create_deployment_kit
+from app.services.bundler import (
+    KitMode,
+    build_deployment_kit,
+    build_deployment_tarball,
+    stream_deployment_kit,
+)
+
+try:
+    import zstandard
+except ImportError:  # Optional: without it kits are served as plain deflated ZIPs
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# zstd level for deployment kit transport compression (fast, good ratio)
+KIT_ZSTD_LEVEL = 3
+
+# Kits whose generated content stays under this size are built whole and sent
+# as one fixed-length response (Content-Length lets clients show progress and
+# avoids chunked framing); larger ones are streamed as they are built. The
+# content size bounds the archive size, as compression only shrinks text.
+KIT_STREAM_THRESHOLD_BYTES = 256 * 1024
+
 # Create API router
 router = APIRouter(prefix="/api/v1", tags=["Infrastructure"])
 
@@ -156,7 +177,7 @@ async def generate_infrastructure(request: GenerateRequest) -> GenerateResponse:
     try:
         # Execute the workflow
         logger.info("Starting workflow execution...")
-        result = run_workflow(request.prompt)
+        result = await arun_workflow(request.prompt)
         
         # Format response (Phase 9: Added new metrics fields)
         response = GenerateResponse(
@@ -195,23 +216,54 @@ async def generate_infrastructure(request: GenerateRequest) -> GenerateResponse:
         )
 
 
+def _accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows the given content coding (q > 0)."""
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() != coding:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _build_zstd_kit(state: AgentState) -> bytes:
+    """Build the kit with stored members and zstd-compress it for transport."""
+    kit = build_deployment_kit(state, compression=zipfile.ZIP_STORED)
+    return zstandard.ZstdCompressor(level=KIT_ZSTD_LEVEL).compress(kit)
+
+
 @router.post(
     "/download",
     summary="Download Deployment Kit",
     description="Generate and download a complete deployment kit ZIP archive",
     responses={
         200: {
-            "description": "ZIP file containing deployment kit",
+            "description": "ZIP file (or .tar.zst with ?format=tar.zst) containing deployment kit",
             "content": {
                 "application/zip": {
                     "schema": {"type": "string", "format": "binary"}
+                },
+                "application/zstd": {
+                    "schema": {"type": "string", "format": "binary"}
                 }
             }
         },
+        400: {"description": "Requested archive format unavailable"},
         500: {"description": "Bundle creation failed"}
     }
 )
-async def download_deployment_kit(request: DownloadRequest):
+async def download_deployment_kit(
+    request: DownloadRequest,
+    http_request: Request,
+    mode: KitMode = "fast",
+    kit_format: Literal["zip", "tar.zst"] = Query("zip", alias="format")
+):
     """
     Download a complete deployment kit as a ZIP archive.
     
@@ -225,12 +277,28 @@ async def download_deployment_kit(request: DownloadRequest):
     
     Args:
         request (DownloadRequest): Contains the project state and metadata
+        mode (str): Query parameter selecting the ZIP compression tier:
+            "fast" (default, deflate level 1 or INFRAGENIE_ZIP_LEVEL),
+            "balanced" (deflate level 6) or "archive" (LZMA, smallest but
+            slowest to build). Levels up to 3 use ISA-L when installed,
+            higher ones the stdlib zlib.
+        format (str): Query parameter selecting the archive format: "zip"
+            (default, opens everywhere) or "tar.zst" (zstd-compressed
+            tarball: less server CPU and smaller; unpack with
+            `tar --zstd -xf`). tar.zst needs the zstandard package.
     
     Returns:
-        StreamingResponse: ZIP file download
+        Response: ZIP file download with Content-Length, or a
+            StreamingResponse for kits above KIT_STREAM_THRESHOLD_BYTES of
+            generated content. For kits below that threshold, clients
+            sending `Accept-Encoding: zstd` receive the archive with stored
+            (uncompressed) members and `Content-Encoding: zstd` instead, which
+            is cheaper to build than deflating each member and about as small
+            on the wire. Larger kits always stream, whatever the client accepts.
     
     Raises:
-        HTTPException: 500 if bundle creation fails
+        HTTPException: 400 if tar.zst is requested but unavailable,
+            500 if bundle creation fails
     
     Example:
         ```bash
@@ -244,15 +312,34 @@ async def download_deployment_kit(request: DownloadRequest):
           -H "Content-Type: application/json" \
           -d "$RESPONSE" \
           --output deployment-kit.zip
+        
+        # Smallest archive (LZMA members)
+        curl -X POST "http://localhost:8000/api/v1/download?mode=archive" \
+          -H "Content-Type: application/json" \
+          -d "$RESPONSE" \
+          --output deployment-kit.zip
+        
+        # zstd tarball (unpack with: tar --zstd -xf deployment-kit.tar.zst)
+        curl -X POST "http://localhost:8000/api/v1/download?format=tar.zst" \
+          -H "Content-Type: application/json" \
+          -d "$RESPONSE" \
+          --output deployment-kit.tar.zst
         ```
     
     Note:
-        - ZIP file is generated on-the-fly
+        - ZIP file is generated on-the-fly, off the event loop (worker
+          thread), so a kit build never stalls other requests
         - File size typically 10-50 KB
         - All files have proper permissions
     """
     logger.info(f"Download request for project: {request.project_id}")
     
+    if kit_format == "tar.zst" and zstandard is None:
+        raise HTTPException(
+            status_code=400,
+            detail="tar.zst deployment kits are not available on this server"
+        )
+    
     try:
         # Reconstruct state from request
         state: AgentState = {
@@ -266,25 +353,84 @@ async def download_deployment_kit(request: DownloadRequest):
             "is_clean": True
         }
         
-        # Create the deployment kit
-        logger.info("Creating deployment kit bundle...")
-        zip_buffer = create_deployment_kit(state)
+        # Encoded size, not character count: non-ASCII prompts and code take
+        # more bytes in the archive than len(str) suggests
+        content_size = sum(
+            len(text.encode("utf-8"))
+            for text in (request.terraform_code, request.ansible_playbook, request.user_prompt)
+        )
         
-        # Reset buffer position for reading
-        zip_buffer.seek(0)
+        # zstd transport ships stored members, so it only stands in for the
+        # default tier; the other tiers pick the on-disk archive format. It
+        # builds the whole kit in memory, so large kits stream instead
+        use_zstd = (
+            kit_format == "zip" and mode == "fast" and zstandard is not None
+            and content_size < KIT_STREAM_THRESHOLD_BYTES
+            and _accepts_encoding(http_request.headers.get("accept-encoding", ""), "zstd")
+        )
+        
+        if kit_format == "tar.zst":
+            filename = f"{request.project_id}-deployment-kit.tar.zst"
+            logger.info("Creating deployment kit tarball...")
+            kit = await asyncio.to_thread(build_deployment_tarball, state)
+            
+            logger.info(f"✓ Deployment kit created: {filename}")
+            
+            return Response(
+                content=kit,
+                media_type="application/zstd",
+                headers={
+                    "Content-Disposition": f"attachment; filename={filename}"
+                }
+            )
         
         # Generate filename
         filename = f"{request.project_id}-deployment-kit.zip"
         
-        logger.info(f"✓ Deployment kit created: {filename}")
+        if use_zstd:
+            # Store members and compress the whole archive once for transport
+            logger.info("Creating deployment kit bundle (stored, zstd transport)...")
+            body = await asyncio.to_thread(_build_zstd_kit, state)
+            
+            logger.info(f"✓ Deployment kit created: {filename}")
+            
+            return Response(
+                content=body,
+                media_type="application/zip",
+                headers={
+                    "Content-Disposition": f"attachment; filename={filename}",
+                    "Content-Encoding": "zstd",
+                    "Vary": "Accept-Encoding"
+                }
+            )
+        
+        if content_size < KIT_STREAM_THRESHOLD_BYTES:
+            # Small kit: build it whole (often a cache hit) and send it at once
+            logger.info(f"Creating deployment kit bundle (mode={mode})...")
+            kit = await asyncio.to_thread(build_deployment_kit, state, mode=mode)
+            
+            logger.info(f"✓ Deployment kit created: {filename}")
+            
+            return Response(
+                content=kit,
+                media_type="application/zip",
+                headers={
+                    "Content-Disposition": f"attachment; filename={filename}",
+                    "Vary": "Accept-Encoding"
+                }
+            )
+        
+        # Large kit: stream it, each member ships as soon as it is written
+        logger.info(f"Streaming deployment kit bundle (mode={mode})...")
         
         # Return as streaming response
         return StreamingResponse(
-            zip_buffer,
+            stream_deployment_kit(state, mode=mode),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Type": "application/zip"
+                "Content-Type": "application/zip",
+                "Vary": "Accept-Encoding"
             }
         )
     
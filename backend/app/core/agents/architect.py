@@ -17,6 +17,7 @@ Design Philosophy:
 
 import logging
 import os
+import time
 from typing import Dict, Any
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -24,7 +25,9 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 from app.core.state import AgentState
 from app.core.utils import clean_llm_output
-from app.core.model_config import create_standard_llm  # Use dynamic model selection
+from app.core.metrics import LLM_CALLS
+from app.core.singleflight import llm_flight, make_key
+from app.core.model_config import ModelConfig, ModelTier, get_model_for_task, record_llm_latency  # Use dynamic model selection
 from app.core.agents.templates import (
     K8S_CLUSTER_TEMPLATE,
     COMPLETENESS_CHECKLIST,
@@ -499,23 +502,28 @@ resource "aws_instance" "web_server" {
 """
 
 
-def create_architect_chain():
+def create_architect_chain(tier: ModelTier = ModelTier.STANDARD):
     """
     Create the LangChain LLM chain for the Architect agent.
     
     This function initializes the ChatOpenAI model with GPT-4 and constructs
     a prompt template that includes the system message and user context.
     
+    Args:
+        tier: Model tier chosen by the model router (default: STANDARD)
+    
     Returns:
         Runnable: A LangChain chain that can be invoked with state parameters
     
     Configuration:
-        - Model: Dynamically selected via model_config (llama-3.1-70b for code quality)
+        - Model: Dynamically selected via model_config (70b by default; the router
+          may diversify to the 8b model after repeated failed retries)
         - Temperature: 0.1 (low randomness for consistent code generation)
         - Max tokens: 1500 (optimized - reduced from 2000 to save tokens)
     """
     # Use centralized model configuration for dual-API support
-    llm = create_standard_llm(
+    llm = ModelConfig.create_llm(
+        tier=tier,
         temperature=0.1,  # Low temperature for deterministic code generation
         max_tokens=1500   # Reduced from 2000 - most infrastructure is under 1000 tokens
     )
@@ -637,8 +645,9 @@ def architect_node(state: AgentState) -> Dict[str, Any]:
     logger.info(f"Retry count: {state.get('retry_count', 0)}")
     
     try:
-        # Create the LLM chain
-        chain = create_architect_chain()
+        # Create the LLM chain on the tier picked by the model router
+        tier = get_model_for_task("architect", state)
+        chain = create_architect_chain(tier)
         
         # Build input with context
         user_input = build_architect_input(state)
@@ -647,7 +656,14 @@ def architect_node(state: AgentState) -> Dict[str, Any]:
         
         # Invoke the LLM
         logger.info("Invoking GPT-4 for code generation...")
-        response = chain.invoke({"user_input": user_input})
+        LLM_CALLS.labels(tier=tier.value, task="architect").inc()
+        started = time.monotonic()
+        # Concurrent identical requests share one upstream call
+        response = llm_flight.do(
+            make_key("architect", tier.value, user_input),
+            lambda: chain.invoke({"user_input": user_input})
+        )
+        record_llm_latency("architect", tier, time.monotonic() - started)
         
         # Extract and clean the generated code
         generated_code = clean_llm_output(response.content, "hcl")
@@ -664,6 +680,7 @@ def architect_node(state: AgentState) -> Dict[str, Any]:
             "retry_count": new_retry_count,
             "validation_error": None,  # Reset for next validation
             "security_errors": [],      # Reset for next scan
+            "architect_tier": tier.value,  # Validator reports the outcome for this tier
         }
     
     except Exception as e:
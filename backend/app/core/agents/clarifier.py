@@ -32,7 +32,8 @@ from typing import Dict, Any
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from app.core.model_config import create_lightweight_llm  # Use lightweight model for analysis
+from app.core.metrics import LLM_CALLS
+from app.core.model_config import ModelTier, create_lightweight_llm  # Use lightweight model for analysis
 
 logger = logging.getLogger(__name__)
 
@@ -254,7 +255,7 @@ def clarify_requirements(state: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "assumptions": {},
             "validation_error": "No infrastructure request provided",
-            "logs": state.get("logs", []) + ["❌ Clarification failed: Empty request"]
+            "logs": ["❌ Clarification failed: Empty request"]
         }
     
     try:
@@ -270,6 +271,7 @@ def clarify_requirements(state: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"Invoking clarifier LLM for: {user_prompt[:100]}...")
         
         # Invoke the LLM
+        LLM_CALLS.labels(tier=ModelTier.LIGHTWEIGHT.value, task="clarifier").inc()
         response = llm.invoke(messages)
         
         # Parse JSON response (handle potential markdown fencing)
@@ -300,7 +302,7 @@ def clarify_requirements(state: Dict[str, Any]) -> Dict[str, Any]:
                     "environment": "development"
                 },
                 "validation_error": None,
-                "logs": state.get("logs", []) + ["⚠️  Clarification parse error - using defaults"]
+                "logs": ["⚠️  Clarification parse error - using defaults"]
             }
         
         # Extract fields
@@ -320,7 +322,7 @@ def clarify_requirements(state: Dict[str, Any]) -> Dict[str, Any]:
             return {
                 "assumptions": {},
                 "validation_error": error_message,
-                "logs": state.get("logs", []) + ["❌ Request too vague - clarification needed"]
+                "logs": ["❌ Request too vague - clarification needed"]
             }
         
         # We can proceed - log assumptions
@@ -337,7 +339,7 @@ def clarify_requirements(state: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "assumptions": assumptions,
             "validation_error": None,
-            "logs": state.get("logs", []) + [log_message]
+            "logs": [log_message]
         }
     
     except Exception as e:
@@ -351,5 +353,5 @@ def clarify_requirements(state: Dict[str, Any]) -> Dict[str, Any]:
                 "environment": "development"
             },
             "validation_error": None,
-            "logs": state.get("logs", []) + [f"⚠️  Clarifier error - using fallback defaults"]
+            "logs": [f"⚠️  Clarifier error - using fallback defaults"]
         }
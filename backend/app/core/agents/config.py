@@ -18,7 +18,9 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 from app.core.state import AgentState
 from app.core.utils import clean_llm_output
-from app.core.model_config import create_standard_llm  # Use standard model for code generation
+from app.core.metrics import LLM_CALLS
+from app.core.model_config import ModelTier, create_standard_llm  # Use standard model for code generation
+from app.core.singleflight import llm_flight, make_key
 
 logger = logging.getLogger(__name__)
 
@@ -252,7 +254,12 @@ def config_node(state: AgentState) -> Dict[str, Any]:
         
         # Invoke the LLM
         logger.info("Invoking GPT-4 for Ansible playbook generation...")
-        response = chain.invoke({"user_input": user_input})
+        LLM_CALLS.labels(tier=ModelTier.STANDARD.value, task="ansible").inc()
+        # Concurrent identical requests share one upstream call
+        response = llm_flight.do(
+            make_key("config", user_input),
+            lambda: chain.invoke({"user_input": user_input})
+        )
         
         # Extract and clean generated playbook
         playbook_yaml = clean_llm_output(response.content, "yaml")
@@ -275,9 +282,9 @@ def config_node(state: AgentState) -> Dict[str, Any]:
         else:
             logger.warning("⚠ fail2ban security may be missing")
 
-        # Build log entries for observability
-        logs = state.get("logs", [])
-        logs = logs + ["✅ Ansible playbook generated"]
+        # Build log entries for observability (only this node's entries -
+        # the logs channel reducer appends them to the workflow history)
+        logs = ["✅ Ansible playbook generated"]
         if "Cost Assassin" in playbook_yaml or "shutdown" in playbook_yaml:
             logs.append("✅ Cost Assassin cron job included")
         else:
@@ -320,11 +327,11 @@ def config_node(state: AgentState) -> Dict[str, Any]:
         user: root
 """
         
-    logger.warning("Using fallback minimal playbook")
+        logger.warning("Using fallback minimal playbook")
         
-    logs = state.get("logs", []) + [f"❌ Config Agent error: {str(e)}", "⚠ Using fallback playbook"]
-    return {
-      "ansible_playbook": fallback_playbook,
-      "is_clean": True,
-      "logs": logs
-    }
+        logs = [f"❌ Config Agent error: {str(e)}", "⚠ Using fallback playbook"]
+        return {
+            "ansible_playbook": fallback_playbook,
+            "is_clean": True,
+            "logs": logs
+        }
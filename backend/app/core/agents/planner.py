@@ -30,7 +30,8 @@ from typing import Dict, Any
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from app.core.model_config import create_lightweight_llm  # Use lightweight model for planning
+from app.core.metrics import LLM_CALLS
+from app.core.model_config import ModelTier, create_lightweight_llm  # Use lightweight model for planning
 
 logger = logging.getLogger(__name__)
 
@@ -285,7 +286,7 @@ def planner_agent(state: Dict[str, Any]) -> Dict[str, Any]:
             "execution_order": [],
             "assumptions": {},
             "infrastructure_type": "unknown",
-            "logs": state.get("logs", []) + ["⚠️  Planning skipped: No user prompt"]
+            "logs": ["⚠️  Planning skipped: No user prompt"]
         }
     
     try:
@@ -301,6 +302,7 @@ def planner_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"Invoking planner LLM for: {user_prompt[:100]}...")
         
         # Invoke the LLM
+        LLM_CALLS.labels(tier=ModelTier.LIGHTWEIGHT.value, task="planner").inc()
         response = llm.invoke(messages)
         
         # Parse JSON response (handle potential markdown fencing)
@@ -329,7 +331,7 @@ def planner_agent(state: Dict[str, Any]) -> Dict[str, Any]:
                 "execution_order": [],
                 "assumptions": {"region": "us-east-1"},
                 "infrastructure_type": "unknown",
-                "logs": state.get("logs", []) + ["⚠️  Planning failed: JSON parse error"]
+                "logs": ["⚠️  Planning failed: JSON parse error"]
             }
         
         # Extract fields from plan
@@ -356,7 +358,7 @@ def planner_agent(state: Dict[str, Any]) -> Dict[str, Any]:
             "execution_order": execution_order,
             "assumptions": assumptions,
             "infrastructure_type": infrastructure_type,
-            "logs": state.get("logs", []) + [log_message]
+            "logs": [log_message]
         }
     
     except Exception as e:
@@ -368,5 +370,5 @@ def planner_agent(state: Dict[str, Any]) -> Dict[str, Any]:
             "execution_order": [],
             "assumptions": {"region": "us-east-1"},
             "infrastructure_type": "unknown",
-            "logs": state.get("logs", []) + [f"⚠️  Planning error: {str(e)}"]
+            "logs": [f"⚠️  Planning error: {str(e)}"]
         }
@@ -9,8 +9,14 @@ Phase 8 Enhancement: Integrated planner, clarifier, and deep validation nodes
 into the workflow for improved infrastructure completeness.
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Dict, Any, Literal
+import random
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, Any, List, Literal, Optional
 from langgraph.graph import StateGraph, END
 
 from app.core.state import AgentState
@@ -18,12 +24,16 @@ from app.core.agents.architect import architect_node
 from app.core.agents.config import config_node
 from app.core.agents.planner import planner_agent
 from app.core.agents.clarifier import clarify_requirements
-from app.services.sandbox import validate_terraform, run_checkov
-from app.services.completeness import validate_completeness, get_completion_advice
+from app.services.sandbox import validate_terraform, run_checkov, terraform_workspace
+from app.services.completeness import (
+    validate_completeness,
+    get_completion_advice,
+    detect_infrastructure_pattern,
+    count_total_resources
+)
 from app.services.deep_validation import deep_validator_node
 from app.services.finops import get_cost_estimate
-# Assuming parser is available here or inside the function as originally written
-# from app.services.parser import parse_hcl_to_graph 
+from app.core.model_config import ModelTier, record_llm_result
 
 logger = logging.getLogger(__name__)
 
@@ -31,33 +41,116 @@ logger = logging.getLogger(__name__)
 # Reduced from 5 to 3 to save API tokens (~40% savings on failed attempts)
 MAX_RETRIES = 3
 
+# Exponential backoff (with jitter) before each architect retry, so a
+# rate-limited LLM provider is not hit again immediately by every retry
+BASE_BACKOFF = 1.0   # seconds, doubled per retry
+MAX_BACKOFF = 30.0   # upper bound for a single wait
+JITTER = 1.0         # random extra delay to de-synchronize concurrent runs
 
-def validator_node(state: AgentState) -> Dict[str, Any]:
+# Upper bound on concurrently executing runs in arun_workflow_batch
+BATCH_MAX_CONCURRENCY = 8
+
+# Log banners (node sections and full workflow runs)
+NODE_BANNER = "=" * 60
+RUN_BANNER = "=" * 70
+
+# Bounded memo caches for the pure, code-keyed downstream steps (parser, FinOps).
+# Security retry loops frequently converge back to a code variant that was
+# already parsed/costed, so these make the final pass free on a hit.
+MEMO_MAX_ENTRIES = 128
+_parse_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+_cost_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _memoized(
+    cache: OrderedDict,
+    terraform_code: str,
+    compute: Callable[[str], Any],
+    cacheable: Optional[Callable[[Any], bool]] = None
+) -> Any:
+    """
+    Return compute(terraform_code), memoized in an LRU cache keyed by the code's SHA-1.
+    
+    Results rejected by `cacheable` (e.g. transient tool failures) are returned
+    but not stored, so the next call retries the computation.
+    """
+    key = hashlib.sha1(terraform_code.encode("utf-8")).digest()
+    
+    with _memo_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    
+    value = compute(terraform_code)
+    
+    if cacheable is None or cacheable(value):
+        with _memo_lock:
+            cache[key] = value
+            if len(cache) > MEMO_MAX_ENTRIES:
+                cache.popitem(last=False)
+    
+    return value
+
+
+def _attempt_signature(terraform_code: str, error: str) -> str:
+    """
+    Short digest identifying a failed attempt by its code and validation error.
+    """
+    payload = f"{terraform_code}|{error}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+async def validator_node(state: AgentState) -> Dict[str, Any]:
     """
-    LangGraph node that validates Terraform code syntax and configuration.
-    executes `terraform validate` on the generated code.
+    LangGraph node that validates Terraform code syntax, completeness and configuration.
+    
+    Executes `terraform validate`, the Checkov security scan and the
+    completeness check concurrently on the generated code. The checks are
+    independent, so the node costs max(validate, checkov, completeness)
+    instead of their sum, and the completeness step no longer needs its own
+    superstep. The code is written to disk once, into a workspace both tools
+    share.
+    
+    Results are merged by priority: a syntax error wins and discards the
+    other results; otherwise the completeness outcome decides validation_error.
+    Checkov results are kept for security_node, which reports on them later in
+    the flow (deep validation does not modify terraform_code).
     """
-    logger.info("VALIDATOR NODE: Running Terraform validation")
+    logger.info("VALIDATOR NODE: Running Terraform validation, completeness check and security scan")
     terraform_code = state.get("terraform_code", "")
 
     if not terraform_code:
         return {"validation_error": "No Terraform code generated"}
 
-    # Run validation tool
-    error = validate_terraform(terraform_code)
+    # Run all checks side by side, the tools on one shared copy of the code
+    with terraform_workspace(terraform_code) as workspace:
+        error, violations, completeness = await asyncio.gather(
+            validate_terraform(terraform_code, workspace=workspace),
+            run_checkov(terraform_code, workspace=workspace),
+            asyncio.to_thread(completeness_validator_node, state)
+        )
 
+    # Feed the outcome back to the model router's statistics
+    architect_tier = state.get("architect_tier")
+    if architect_tier:
+        record_llm_result("architect", ModelTier(architect_tier), success=error is None)
+    
     if error:
-        logger.warning(f"Validation failed: {error[:100]}...")
+        # Scan and completeness results for invalid code are meaningless - discard them
+        logger.warning("Validation failed: %s...", error[:100])
         return {
             "validation_error": error,
-            "logs": state.get("logs", []) + ["❌ Terraform validation failed: Syntax error detected"]
+            "attempt_signatures": [_attempt_signature(terraform_code, error)],
+            "logs": ["❌ Terraform validation failed: Syntax error detected"]
         }
     else:
         logger.info("✓ Validation passed successfully")
-        return {
-            "validation_error": None,
-            "logs": state.get("logs", []) + ["✅ Terraform syntax validation passed"]
-        }
+        update = dict(completeness)
+        update["security_violations"] = violations
+        update["logs"] = ["✅ Terraform syntax validation passed"] + completeness.get("logs", [])
+        update.setdefault("validation_error", None)
+        return update
 
 
 def completeness_validator_node(state: AgentState) -> Dict[str, Any]:
@@ -81,16 +174,9 @@ def completeness_validator_node(state: AgentState) -> Dict[str, Any]:
             "validation_error": "No Terraform code to validate",
             "completeness_score": 0.0,
             "missing_components": ["terraform code"],
-            "logs": state.get("logs", []) + ["❌ Completeness check failed: No code generated"]
+            "logs": ["❌ Completeness check failed: No code generated"]
         }
     
-    # Import completeness functions (avoid circular imports)
-    from app.services.completeness import (
-        validate_completeness as validate_completeness_detailed,
-        detect_infrastructure_pattern,
-        count_total_resources
-    )
-    
     # Detect infrastructure type for classification
     pattern = detect_infrastructure_pattern(user_prompt)
     total_resources = count_total_resources(terraform_code)
@@ -135,10 +221,10 @@ def completeness_validator_node(state: AgentState) -> Dict[str, Any]:
             else:
                 completeness_score = 0.3
         
-        logger.info(f"Completeness score: {completeness_score:.2f}, Infrastructure type: {infrastructure_type}")
+        logger.info("Completeness score: %.2f, Infrastructure type: %s", completeness_score, infrastructure_type)
         
         if error:
-            logger.warning(f"Completeness validation failed: {error}")
+            logger.warning("Completeness validation failed: %s", error)
             
             # Generate specific advice for the Architect on what to add
             advice = get_completion_advice(user_prompt, error)
@@ -149,7 +235,7 @@ def completeness_validator_node(state: AgentState) -> Dict[str, Any]:
                 "completeness_score": completeness_score,
                 "missing_components": missing_components_list,
                 "infrastructure_type": infrastructure_type,
-                "logs": state.get("logs", []) + [f"❌ Completeness check failed: {error}"]
+                "logs": [f"❌ Completeness check failed: {error}"]
             }
         else:
             logger.info("✓ Completeness validation passed")
@@ -159,17 +245,17 @@ def completeness_validator_node(state: AgentState) -> Dict[str, Any]:
                 "completeness_score": completeness_score,
                 "missing_components": [],
                 "infrastructure_type": infrastructure_type,
-                "logs": state.get("logs", []) + ["✅ Infrastructure completeness verified"]
+                "logs": ["✅ Infrastructure completeness verified"]
             }
     
     except Exception as e:
-        logger.error(f"Error during completeness validation: {e}")
+        logger.error("Error during completeness validation: %s", e)
         return {
             "validation_error": None,  # Don't block on validation errors
             "completeness_score": 0.8,  # Assume reasonable
             "missing_components": [],
             "infrastructure_type": infrastructure_type,
-            "logs": state.get("logs", []) + [f"⚠️  Completeness check skipped: {str(e)}"]
+            "logs": [f"⚠️  Completeness check skipped: {str(e)}"]
         }
 
 
@@ -182,12 +268,15 @@ def parser_node(state: AgentState) -> Dict[str, Any]:
     # Import inside function to avoid potential circular imports if necessary
     try:
         from app.services.parser import parse_hcl_to_graph
-        graph_data = parse_hcl_to_graph(hcl_code) if hcl_code else {"nodes": [], "edges": []}
+        if hcl_code:
+            graph_data = _memoized(_parse_cache, hcl_code, parse_hcl_to_graph)
+        else:
+            graph_data = {"nodes": [], "edges": []}
     except ImportError as e:
-        logger.warning(f"Parser service import failed: {e}")
+        logger.warning("Parser service import failed: %s", e)
         graph_data = {"nodes": [], "edges": []}
     except Exception as e:
-        logger.error(f"Parser execution failed: {e}")
+        logger.error("Parser execution failed: %s", e)
         graph_data = {"nodes": [], "edges": []}
         
     return {"graph_data": graph_data}
@@ -195,9 +284,13 @@ def parser_node(state: AgentState) -> Dict[str, Any]:
 
 def security_node(state: AgentState) -> Dict[str, Any]:
     """
-    LangGraph node that runs security checks (Checkov) and returns detailed violations.
+    LangGraph node that reports security check (Checkov) results and gates the retry branch.
+    
+    The Checkov scan itself already ran alongside `terraform validate` in
+    validator_node; this node turns its detailed violations into the
+    is_clean flag and legacy check ID list used for routing.
     """
-    logger.info("SECURITY NODE: Running security scan")
+    logger.info("SECURITY NODE: Evaluating security scan results")
     terraform_code = state.get("terraform_code", "")
     
     if not terraform_code:
@@ -208,11 +301,11 @@ def security_node(state: AgentState) -> Dict[str, Any]:
             "is_clean": False
         }
     
-    # Run Checkov and get detailed violations
-    violations = run_checkov(terraform_code)
+    # Detailed violations produced by the concurrent scan in validator_node
+    violations = state.get("security_violations", [])
     
     if violations:
-        logger.warning(f"Security checks failed: {len(violations)} violations found")
+        logger.warning("Security checks failed: %d violations found", len(violations))
         
         # Extract IDs for backward compatibility
         check_ids = [v["check_id"] for v in violations]
@@ -220,82 +313,130 @@ def security_node(state: AgentState) -> Dict[str, Any]:
         # Log each violation
         for v in violations:
             logger.warning(
-                f"  → [{v['check_id']}] {v['check_name']} "
-                f"on {v['resource']}"
+                "  → [%s] %s on %s",
+                v["check_id"], v["check_name"], v["resource"]
             )
         
         return {
             "security_errors": check_ids,  # Legacy support
-            "security_violations": violations,  # Detailed info for remediation
             "is_clean": False,
-            "logs": state.get("logs", []) + [f"❌ Security scan found {len(violations)} violation(s)"]
+            "logs": [f"❌ Security scan found {len(violations)} violation(s)"]
         }
     else:
         logger.info("✓ Security scan passed - no violations found")
         return {
             "security_errors": [],
-            "security_violations": [],
             "is_clean": True,
-            "logs": state.get("logs", []) + ["✅ Security scan passed - no violations"]
+            "logs": ["✅ Security scan passed - no violations"]
         }
 
 
+async def retry_backoff_node(state: AgentState) -> Dict[str, Any]:
+    """
+    LangGraph node placed on every retry edge back to the architect.
+    
+    Waits min(BASE_BACKOFF * 2**(retry_count - 1) + jitter, MAX_BACKOFF) seconds
+    before the next generation attempt (~1s, ~2s, ~4s for MAX_RETRIES=3).
+    The wait is an asyncio.sleep, so other workflows keep running meanwhile.
+    """
+    retry_count = state.get("retry_count", 0)
+    delay = min(
+        BASE_BACKOFF * 2 ** max(retry_count - 1, 0) + random.uniform(0, JITTER),
+        MAX_BACKOFF
+    )
+    logger.info("RETRY BACKOFF: waiting %.1fs before architect retry %d", delay, retry_count + 1)
+    await asyncio.sleep(delay)
+    return {}
+
+
+def route_after_architect(state: AgentState) -> Literal["validator", "end"]:
+    """
+    Conditional edge function that routes flow after code generation.
+    If the architect produced no code (LLM failure, rate limit), end the
+    workflow immediately instead of spending validator/security supersteps
+    and sandbox subprocesses on empty input.
+    """
+    if not state.get("terraform_code"):
+        logger.error("✗ Architect produced no Terraform code. Workflow failed.")
+        return "end"
+    
+    return "validator"
+
+
 def route_after_validator(state: AgentState) -> Literal["architect", "end"]:
     """
     Conditional edge function that routes flow after validation FAILED.
     (Success case is handled by the lambda in the graph definition).
+    
+    If the latest failure has the same signature (code + error) as an earlier
+    one, the architect is stuck producing identical output; retrying again is
+    certain to waste an LLM call, so the workflow ends early.
     """
+    signatures = state.get("attempt_signatures") or []
+    if len(signatures) > 1 and signatures[-1] in signatures[:-1]:
+        logger.error("✗ Architect repeated an identical failed attempt. Workflow failed.")
+        return "end"
+    
     retry_count = state.get("retry_count", 0)
     
     if retry_count < MAX_RETRIES:
         # Validation failed but retries available
         logger.warning(
-            f"→ Routing back to ARCHITECT for retry "
-            f"({retry_count}/{MAX_RETRIES})"
+            "→ Routing back to ARCHITECT for retry (%d/%d)",
+            retry_count, MAX_RETRIES
         )
         return "architect"
     
     # Max retries exceeded - fail workflow
-    logger.error(
-        f"✗ Max retries ({MAX_RETRIES}) exceeded. Workflow failed."
-    )
+    logger.error("✗ Max retries (%d) exceeded. Workflow failed.", MAX_RETRIES)
     return "end"
 
 
-def route_after_security(state: AgentState) -> Literal["architect", "parser"]:
+def route_from_validator(state: AgentState) -> Literal["validate_deep", "architect", "end"]:
+    """
+    Conditional edge function that routes flow out of the validator node.
+    If syntax and completeness checks passed, continue to deep validation;
+    otherwise (syntax error or incomplete infrastructure, with completion
+    advice for the architect) defer to route_after_validator for the retry
+    decision.
+    """
+    validation_error = state.get("validation_error")
+    route = "validate_deep" if validation_error is None else route_after_validator(state)
+    logger.info("ROUTING: validator → %s (validation_error=%s)", route, validation_error)
+    return route
+
+
+def route_after_security(state: AgentState) -> Literal["architect", "post_security"]:
     """
     Conditional edge function that routes flow after security scanning.
-    If clean, proceed to parser (to visualize final secure code).
+    If clean, proceed to post-security pipeline (to visualize and cost the final secure code).
     If violations, retry with architect.
     """
-    is_clean = state.get("is_clean", False)
-    retry_count = state.get("retry_count", 0)
-    
-    if is_clean:
-        logger.info("→ Routing to PARSER node (code is secure)")
-        return "parser"
+    # Clean code is the common case - decide it with a single lookup
+    if state.get("is_clean", False):
+        logger.info("→ Routing to POST-SECURITY pipeline (code is secure)")
+        return "post_security"
         
     # If we are here, there are security errors
+    retry_count = state.get("retry_count", 0)
     if retry_count < MAX_RETRIES:
         logger.warning(
-            f"→ Security violations found. Routing back to ARCHITECT for retry "
-            f"({retry_count}/{MAX_RETRIES})"
+            "→ Security violations found. Routing back to ARCHITECT for retry (%d/%d)",
+            retry_count, MAX_RETRIES
         )
         return "architect"
 
-    # Max retries exceeded - proceed to parser anyway (user can decide)
-    logger.warning(
-        f"⚠ Max retries ({MAX_RETRIES}) exceeded. "
-    )
-    logger.info("→ Proceeding to Parser despite security issues")
-    return "parser"
+    # Max retries exceeded - proceed to post-security pipeline anyway (user can decide)
+    logger.warning("⚠ Max retries (%d) exceeded.", MAX_RETRIES)
+    logger.info("→ Proceeding to post-security pipeline despite security issues")
+    return "post_security"
 
 
 def finops_node(state: AgentState) -> Dict[str, Any]:
     """
     LangGraph node that estimates infrastructure costs using Infracost.
     """
-    logger.info("=" * 60)
+    logger.info(NODE_BANNER)
     logger.info("FINOPS NODE: Calculating cost estimate")
     
     terraform_code = state.get("terraform_code", "")
@@ -304,37 +445,75 @@ def finops_node(state: AgentState) -> Dict[str, Any]:
         logger.warning("No Terraform code for cost estimation")
         return {
             "cost_estimate": "Unable to estimate (no code)",
-            "logs": state.get("logs", []) + ["⚠️  Cost estimation skipped - no code available"]
+            "logs": ["⚠️  Cost estimation skipped - no code available"]
         }
     
-    # Call FinOps service
-    cost = get_cost_estimate(terraform_code)
+    # Call FinOps service (only real "$X/mo" estimates are memoized, not failures)
+    cost = _memoized(
+        _cost_cache,
+        terraform_code,
+        get_cost_estimate,
+        cacheable=lambda estimate: estimate.startswith("$")
+    )
     
-    logger.info(f"✓ Cost estimate: {cost}")
+    logger.info("✓ Cost estimate: %s", cost)
     
     return {
         "cost_estimate": cost,
-        "logs": state.get("logs", []) + [f"💰 Cost calculated: {cost}"]
+        "logs": [f"💰 Cost calculated: {cost}"]
     }
 
 
+async def post_security_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Fused LangGraph node that runs the parser and FinOps steps in a single superstep.
+    
+    Both steps read only the final, secured terraform_code and write disjoint
+    state keys (graph_data vs. cost_estimate/logs), so they run concurrently and
+    their updates are merged into one return value. Compared to chaining
+    parser → finops this saves a superstep, i.e. one full state write per
+    successful workflow, and hides the HCL parse behind the Infracost call.
+    
+    Both steps are synchronous, so they are pushed onto worker threads with
+    asyncio.to_thread and awaited together; the event loop stays free while
+    Infracost runs.
+    
+    The validator is deliberately not fused in here: it gates the completeness
+    and retry branches, so it has to stay its own node.
+    """
+    logger.info("POST-SECURITY NODE: Running parser and FinOps")
+    
+    parser_update, finops_update = await asyncio.gather(
+        asyncio.to_thread(parser_node, state),
+        asyncio.to_thread(finops_node, state)
+    )
+    
+    parser_update.update(finops_update)
+    return parser_update
+
+
+@functools.lru_cache(maxsize=1)
 def create_workflow() -> StateGraph:
     """
     Create and compile the LangGraph workflow.
     
+    The graph topology is static, so the compiled app is cached: repeated
+    calls return the same compiled graph instead of re-running compile()
+    and its edge/node validation.
+    
     Phase 8: Enhanced workflow with planner, clarifier, and deep validation nodes.
     
     Workflow flow:
     1. clarifier: Analyze request and make assumptions
     2. planner: Decompose into components and execution order
     3. architect: Generate Terraform code
-    4. validator: Syntax validation
-    5. completeness_validator: Check infrastructure completeness
-    6. validate_deep: Run terraform plan for deeper validation
-    7. security: Security scanning with Checkov
-    8. parser: Parse to graph structure
-    9. finops: Cost estimation
-    10. ansible: Configuration management
+    4. validator: Syntax validation + completeness check + Checkov scan (concurrent)
+    5. validate_deep: Run terraform plan for deeper validation
+    6. security: Report Checkov results, retry on violations
+    7. post_security: Parse to graph structure + cost estimation (fused)
+    8. ansible: Configuration management
+    
+    Every retry edge back to the architect passes through retry_backoff.
     """
     logger.info("Initializing LangGraph workflow (Phase 8 Enhanced)")
     
@@ -346,12 +525,11 @@ def create_workflow() -> StateGraph:
     workflow.add_node("planner", planner_agent)
     workflow.add_node("architect", architect_node)
     workflow.add_node("validator", validator_node)
-    workflow.add_node("completeness_validator", completeness_validator_node)
     workflow.add_node("validate_deep", deep_validator_node)
-    workflow.add_node("parser", parser_node)
     workflow.add_node("security", security_node)
-    workflow.add_node("finops", finops_node)
+    workflow.add_node("post_security", post_security_node)
     workflow.add_node("ansible", config_node)
+    workflow.add_node("retry_backoff", retry_backoff_node)
     
     # Set entry point (Phase 8: Changed from "architect" to "clarifier")
     workflow.set_entry_point("clarifier")
@@ -363,7 +541,7 @@ def create_workflow() -> StateGraph:
         validation_error = state.get("validation_error")
         if validation_error:
             # Request too vague - need user clarification
-            logger.warning(f"ROUTING: clarifier → END (request too vague)")
+            logger.warning("ROUTING: clarifier → END (request too vague)")
             return "end"
         logger.info("ROUTING: clarifier → planner (assumptions made)")
         return "planner"
@@ -380,55 +558,29 @@ def create_workflow() -> StateGraph:
     # planner → architect (always)
     workflow.add_edge("planner", "architect")
     
-    workflow.add_edge("architect", "validator")
-    
-    # validator → [conditional routing]
-    # If no syntax error, go to completeness validator. Else, check retries.
-    def route_from_validator(state: AgentState):
-        validation_error = state.get("validation_error")
-        route = "completeness_validator" if validation_error is None else route_after_validator(state)
-        logger.info(f"ROUTING: validator → {route} (validation_error={validation_error})")
-        return route
+    # retry_backoff → architect (always - every retry edge passes through the backoff)
+    workflow.add_edge("retry_backoff", "architect")
     
+    # architect → [conditional routing]
+    # Empty output (LLM failure) ends the run; otherwise validate the code.
     workflow.add_conditional_edges(
-        "validator",
-        route_from_validator,
+        "architect",
+        route_after_architect,
         {
-            "completeness_validator": "completeness_validator",  # Syntax passed → check completeness
-            "architect": "architect",  # Retry
-            "end": END                 # Fail
+            "validator": "validator",
+            "end": END
         }
     )
     
-    # completeness_validator → [conditional routing]
-    # If complete, go to deep validation. If incomplete, retry with architect.
-    def route_from_completeness(state: AgentState):
-        validation_error = state.get("validation_error")
-        retry_count = state.get("retry_count", 0)
-        
-        if validation_error is None:
-            logger.info("ROUTING: completeness_validator → validate_deep (infrastructure complete)")
-            return "validate_deep"
-        
-        # Completeness validation failed
-        if retry_count < MAX_RETRIES:
-            logger.warning(
-                f"ROUTING: completeness_validator → architect for retry "
-                f"({retry_count}/{MAX_RETRIES}) - Incomplete infrastructure"
-            )
-            return "architect"
-        
-        # Max retries exceeded - fail workflow
-        logger.error(f"ROUTING: Max retries ({MAX_RETRIES}) exceeded on completeness check")
-        return "end"
-    
+    # validator → [conditional routing]
+    # If syntax and completeness passed, go to deep validation. Else, check retries.
     workflow.add_conditional_edges(
-        "completeness_validator",
-        route_from_completeness,
+        "validator",
+        route_from_validator,
         {
-            "validate_deep": "validate_deep",  # Complete → deep validation with terraform plan
-            "architect": "architect",          # Incomplete → retry with advice
-            "end": END                          # Max retries exceeded
+            "validate_deep": "validate_deep",  # Syntax + completeness passed → terraform plan
+            "architect": "retry_backoff",  # Retry
+            "end": END                 # Fail
         }
     )
     
@@ -445,13 +597,14 @@ def create_workflow() -> StateGraph:
         # Deep validation failed
         if retry_count < MAX_RETRIES:
             logger.warning(
-                f"ROUTING: validate_deep → architect for retry "
-                f"({retry_count}/{MAX_RETRIES}) - Terraform plan issues"
+                "ROUTING: validate_deep → architect for retry "
+                "(%d/%d) - Terraform plan issues",
+                retry_count, MAX_RETRIES
             )
             return "architect"
         
         # Max retries exceeded - proceed to security anyway
-        logger.warning(f"ROUTING: Max retries exceeded on deep validation - proceeding to security")
+        logger.warning("ROUTING: Max retries exceeded on deep validation - proceeding to security")
         return "security"
     
     workflow.add_conditional_edges(
@@ -459,27 +612,24 @@ def create_workflow() -> StateGraph:
         route_from_deep_validation,
         {
             "security": "security",
-            "architect": "architect",
+            "architect": "retry_backoff",
         }
     )
     
     # security → [conditional routing]
-    # If clean, go to parser. If violations, retry with architect.
+    # If clean, go to post-security pipeline. If violations, retry with architect.
     workflow.add_conditional_edges(
         "security",
         route_after_security,
         {
-            "architect": "architect",  # Fix security issues
-            "parser": "parser"         # Clean → parse for visualization
+            "architect": "retry_backoff",          # Fix security issues
+            "post_security": "post_security"   # Clean → parse + cost estimate
         }
     )
     
-    # parser → finops (always)
-    # Parser now runs on final, secured code
-    workflow.add_edge("parser", "finops")
-    
-    # finops → ansible (always)
-    workflow.add_edge("finops", "ansible")
+    # post_security → ansible (always)
+    # Parser and FinOps run together on final, secured code
+    workflow.add_edge("post_security", "ansible")
     
     # ansible → END (always - workflow complete)
     workflow.add_edge("ansible", END)
@@ -490,20 +640,31 @@ def create_workflow() -> StateGraph:
     return app
 
 
-# Create the compiled workflow (singleton)
-workflow_app = create_workflow()
+def get_workflow_app():
+    """
+    Return the compiled workflow singleton, compiling it on first use.
+    
+    Importing this module no longer compiles the graph, so importing it for
+    MAX_RETRIES, routers or type hints (and test collection) stays cheap, and
+    tests can patch node dependencies before the graph is first built.
+    create_workflow() is cached, so every call returns the same compiled app.
+    """
+    return create_workflow()
 
 
-def run_workflow(user_prompt: str) -> AgentState:
+def __getattr__(name: str):
+    # Backwards compatibility: `from app.core.graph import workflow_app`
+    # still works and resolves lazily to the compiled singleton
+    if name == "workflow_app":
+        return get_workflow_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _initial_state(user_prompt: str) -> AgentState:
     """
-    Execute the complete workflow for a user prompt.
+    Build the initial AgentState for a new workflow run.
     """
-    logger.info("=" * 70)
-    logger.info(f"WORKFLOW START: {user_prompt[:50]}...")
-    logger.info("=" * 70)
-    
-    # Initialize state
-    initial_state: AgentState = {
+    return {
         "user_prompt": user_prompt,
         "terraform_code": "",
         "validation_error": None,
@@ -516,6 +677,8 @@ def run_workflow(user_prompt: str) -> AgentState:
         "ansible_playbook": "",
         "graph_data": {"nodes": [], "edges": []},
         "logs": [],  # Real-time event tracking
+        "attempt_signatures": [],
+        "architect_tier": "",
         # Phase 1: Planning and completeness tracking
         "planned_components": [],
         "execution_order": [],
@@ -525,16 +688,31 @@ def run_workflow(user_prompt: str) -> AgentState:
         "missing_components": [],
         "infrastructure_type": "unknown"
     }
+
+
+async def arun_workflow(user_prompt: str) -> AgentState:
+    """
+    Execute the complete workflow for a user prompt.
+    
+    The graph contains async nodes (the concurrent validator scan), so it is
+    driven through ainvoke. Sync nodes are run in the default executor by
+    LangGraph, which keeps the FastAPI event loop free while a workflow runs.
+    """
+    logger.info(RUN_BANNER)
+    logger.info("WORKFLOW START: %s...", user_prompt[:50])
+    logger.info(RUN_BANNER)
+    
+    initial_state = _initial_state(user_prompt)
     
     try:
         # Run the workflow with increased recursion limit for self-healing
-        final_state = workflow_app.invoke(
+        final_state = await get_workflow_app().ainvoke(
             initial_state,
             config={"recursion_limit": 100}
         )
         
         # Log results
-        logger.info("=" * 70)
+        logger.info(RUN_BANNER)
         if final_state.get("is_clean"):
             logger.info("✓ WORKFLOW SUCCESS")
         elif final_state.get("validation_error"):
@@ -544,11 +722,14 @@ def run_workflow(user_prompt: str) -> AgentState:
         
         # Log graph data for debugging
         graph_data = final_state.get("graph_data", {})
-        logger.info(f"📊 Graph Data: {len(graph_data.get('nodes', []))} nodes, {len(graph_data.get('edges', []))} edges")
-        if graph_data.get('nodes'):
-            logger.info(f"   Node sample: {graph_data['nodes'][0] if graph_data['nodes'] else 'none'}")
+        logger.info(
+            "📊 Graph Data: %d nodes, %d edges",
+            len(graph_data.get("nodes", [])), len(graph_data.get("edges", []))
+        )
+        if graph_data.get("nodes"):
+            logger.info("   Node sample: %s", graph_data["nodes"][0])
         
-        logger.info("=" * 70)
+        logger.info(RUN_BANNER)
         
         return final_state
         
@@ -556,4 +737,104 @@ def run_workflow(user_prompt: str) -> AgentState:
         logger.exception("Unhandled exception in workflow execution")
         # Return state with error info for frontend handling
         initial_state["validation_error"] = f"Workflow Execution Error: {str(e)}"
-        return initial_state
\ No newline at end of file
+        return initial_state
+
+
+async def astream_workflow(user_prompt: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Execute the workflow and yield progress events as nodes finish.
+    
+    Drives the compiled graph through astream, which emits each node's
+    partial update as soon as that node completes. New `logs` entries are
+    forwarded immediately, so clients see progress within the first
+    superstep instead of after the full 30-60s run.
+    
+    Yields:
+        {"event": "log", "node": <node name>, "message": <log line>} for every
+        log entry, then exactly one {"event": "done", "state": <final state>}.
+        On failure the final state carries validation_error, as in arun_workflow.
+    """
+    logger.info(RUN_BANNER)
+    logger.info("WORKFLOW STREAM START: %s...", user_prompt[:50])
+    logger.info(RUN_BANNER)
+    
+    # Mirror LangGraph's channel semantics: append reducers for logs and
+    # attempt_signatures, last-write-wins for every other key
+    state: Dict[str, Any] = dict(_initial_state(user_prompt))
+    final_state = None
+    
+    try:
+        async for chunk in get_workflow_app().astream(state, config={"recursion_limit": 100}):
+            for node, update in chunk.items():
+                # The pinned LangGraph closes the stream with {END: <full state>};
+                # its logs were already forwarded, so take it as the result as-is
+                if node == END:
+                    final_state = update
+                    continue
+                if not update:
+                    continue
+                
+                for message in update.get("logs", []):
+                    yield {"event": "log", "node": node, "message": message}
+                
+                for key, value in update.items():
+                    if key in ("logs", "attempt_signatures"):
+                        state[key] = state[key] + value
+                    else:
+                        state[key] = value
+    except Exception as e:
+        logger.exception("Unhandled exception in streamed workflow execution")
+        state["validation_error"] = f"Workflow Execution Error: {str(e)}"
+        final_state = None
+    
+    # Without an END chunk (LangGraph versions streaming updates only), the
+    # merge of every node's update is the final state
+    yield {"event": "done", "state": final_state if final_state is not None else state}
+
+
+def run_workflow(user_prompt: str) -> AgentState:
+    """
+    Synchronous wrapper around arun_workflow for scripts and CLI usage.
+    
+    Must not be called from a running event loop - use arun_workflow there.
+    """
+    return asyncio.run(arun_workflow(user_prompt))
+
+
+async def arun_workflow_batch(user_prompts: List[str]) -> List[AgentState]:
+    """
+    Execute the workflow for several prompts through the graph's native abatch.
+    
+    At most BATCH_MAX_CONCURRENCY runs are in flight at once, which also bounds
+    the number of concurrent terraform/checkov subprocesses and LLM requests.
+    A failing run does not abort the batch: it yields its initial state with
+    validation_error set, exactly like arun_workflow.
+    """
+    logger.info(RUN_BANNER)
+    logger.info("WORKFLOW BATCH START: %d prompt(s)", len(user_prompts))
+    logger.info(RUN_BANNER)
+    
+    initial_states = [_initial_state(prompt) for prompt in user_prompts]
+    results = await get_workflow_app().abatch(
+        initial_states,
+        config={"recursion_limit": 100, "max_concurrency": BATCH_MAX_CONCURRENCY},
+        return_exceptions=True
+    )
+    
+    final_states = []
+    for initial_state, result in zip(initial_states, results):
+        if isinstance(result, Exception):
+            logger.error("Workflow in batch failed: %s", result)
+            initial_state["validation_error"] = f"Workflow Execution Error: {str(result)}"
+            final_states.append(initial_state)
+        else:
+            final_states.append(result)
+    
+    return final_states
+
+
+def run_workflow_batch(user_prompts: List[str]) -> List[AgentState]:
+    """
+    Synchronous wrapper around arun_workflow_batch for scripts and CLI usage.
+    """
+    return asyncio.run(arun_workflow_batch(user_prompts))
@@ -0,0 +1,72 @@
+"""
+LLM Response Cache
+
+This module provides a bounded, in-process response cache for the LangChain
+LLM clients created by model_config. Identical prompts sent to an identically
+configured model (same model id, temperature, max_tokens) are answered from
+memory instead of issuing another Groq inference.
+
+Only near-deterministic clients are cached (see model_config._build_llm):
+at low temperature the same prompt yields effectively the same completion,
+so sharing a result between requests does not change behaviour, while the
+creative (temperature 0.3) planner/clarifier calls always hit the API.
+
+Design Pattern: Exact-match LRU keyed by (prompt, llm_string). LangChain's
+llm_string already encodes the model and its parameters, so clients with
+different settings never share entries. Lookups are O(1) and thread-safe,
+since sync nodes run concurrently in LangGraph's executor threads.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import logging
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of cached completions (each is one LLM response, a few KB)
+LLM_CACHE_MAX_ENTRIES = 256
+
+
+class BoundedLLMCache(BaseCache):
+    """
+    Thread-safe, size-bounded exact-match cache for LLM generations.
+
+    Evicts the least recently used entry once max_entries is exceeded, so
+    memory stays bounded on long-running servers.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], RETURN_VAL_TYPE]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for this prompt/model, if any."""
+        key = (prompt, llm_string)
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+
+        if value is not None:
+            logger.info("LLM cache hit - skipping inference")
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations for this prompt/model, evicting the LRU entry if full."""
+        key = (prompt, llm_string)
+
+        with self._lock:
+            self._entries[key] = return_val
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, **kwargs) -> None:
+        """Drop all cached generations."""
+        with self._lock:
+            self._entries.clear()
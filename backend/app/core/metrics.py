@@ -0,0 +1,26 @@
+"""
+Prometheus Metrics
+
+This module defines the process-wide Prometheus metrics exposed at /metrics.
+Counters and histograms are cheap atomic updates, so they can sit on hot
+paths (health probes, every agent LLM invocation) where formatting a log
+line per call would cost more than the work being observed.
+
+Metrics:
+- infragenie_tool_check_seconds: Latency of CLI tool version checks (/health)
+- infragenie_llm_calls_total: LLM invocations by agents, by model tier and task
+"""
+
+from prometheus_client import Counter, Histogram
+
+TOOL_CHECK_LATENCY = Histogram(
+    "infragenie_tool_check_seconds",
+    "Latency of DevOps CLI tool version checks",
+    ["tool"]
+)
+
+LLM_CALLS = Counter(
+    "infragenie_llm_calls_total",
+    "LLM invocations by agents (including cache hits and shared in-flight calls), by model tier and task",
+    ["tier", "task"]
+)
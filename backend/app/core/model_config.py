@@ -10,15 +10,31 @@ Benefits:
 - Faster response times for non-code tasks
 - High quality maintained for critical code generation
 - Automatic fallback if secondary key not configured
+- Near-deterministic calls are answered from an in-process response cache
 """
 
 import os
+import json
+import functools
 import logging
+import threading
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
 from langchain_groq import ChatGroq
 
+from app.core.llm_cache import BoundedLLMCache
+
 logger = logging.getLogger(__name__)
 
+# Exact-match response cache shared by the LLM clients built here. Only
+# clients at or below this temperature opt in: their completions are
+# effectively deterministic, so repeated identical prompts can safely reuse a
+# response. It is passed per client rather than installed with set_llm_cache,
+# so other LangChain models in the process keep their own caching behaviour.
+LLM_CACHE_MAX_TEMPERATURE = 0.1
+_LLM_CACHE = BoundedLLMCache()
+
 
 class ModelTier(Enum):
     """Model tiers based on task complexity"""
@@ -26,14 +42,39 @@ class ModelTier(Enum):
     STANDARD = "standard"        # 70b model - high quality
 
 
+@functools.lru_cache(maxsize=16)
+def _build_llm(model: str, temperature: float, max_tokens: int, api_key: str) -> ChatGroq:
+    """
+    Construct (once) the ChatGroq client for a fully resolved configuration.
+    
+    Agents build their LLM on every node invocation; caching the instance lets
+    all of them reuse one Groq client and its pooled HTTP keep-alive
+    connections instead of opening new TCP+TLS sessions per request. The API
+    key is part of the key, so rotating it in the environment takes effect.
+    
+    Clients at or below LLM_CACHE_MAX_TEMPERATURE use the module's response
+    cache (_LLM_CACHE); more creative clients bypass it.
+    """
+    logger.info(f"Creating LLM: model={model}, temp={temperature}, max_tokens={max_tokens}")
+    
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        groq_api_key=api_key,
+        cache=_LLM_CACHE if temperature <= LLM_CACHE_MAX_TEMPERATURE else False
+    )
+
+
 class ModelConfig:
     """
     Centralized model configuration with dual-API support
     """
     
-    # Model identifiers
-    LIGHTWEIGHT_MODEL = "llama-3.1-8b-instant"      # Fast, efficient (70% fewer tokens)
-    STANDARD_MODEL = "llama-3.3-70b-versatile"       # High quality (updated model)
+    # Model identifiers (overridable per deployment, e.g. to point a tier at a
+    # faster or lower-precision Groq serving variant without code changes)
+    LIGHTWEIGHT_MODEL = os.getenv("GROQ_LIGHTWEIGHT_MODEL", "llama-3.1-8b-instant")  # Fast, efficient (70% fewer tokens)
+    STANDARD_MODEL = os.getenv("GROQ_STANDARD_MODEL", "llama-3.3-70b-versatile")     # High quality (updated model)
     
     # Default temperatures
     TEMP_DETERMINISTIC = 0.0   # For parsing, analysis
@@ -67,6 +108,9 @@ class ModelConfig:
         """
         Create a configured LLM instance based on tier.
         
+        Instances are cached per (model, temperature, max_tokens, api_key), so
+        repeated calls with the same settings return the same shared client.
+        
         Args:
             tier: Model tier (LIGHTWEIGHT or STANDARD)
             temperature: Override default temperature
@@ -91,14 +135,7 @@ class ModelConfig:
         
         api_key = ModelConfig.get_api_key(tier)
         
-        logger.info(f"Creating LLM: model={model}, temp={temp}, max_tokens={tokens}")
-        
-        return ChatGroq(
-            model=model,
-            temperature=temp,
-            max_tokens=tokens,
-            groq_api_key=api_key
-        )
+        return _build_llm(model, temp, tokens, api_key)
     
     @staticmethod
     def get_model_info(tier: ModelTier) -> dict:
@@ -119,8 +156,8 @@ class ModelConfig:
             }
 
 
-# Task-to-tier mapping for easy reference
-TASK_MODEL_MAP = {
+# Task-to-tier mapping for easy reference (read-only; keys are lowercase)
+TASK_MODEL_MAP = MappingProxyType({
     # Lightweight tasks (8b model)
     "clarifier": ModelTier.LIGHTWEIGHT,
     "planner": ModelTier.LIGHTWEIGHT,
@@ -130,20 +167,167 @@ TASK_MODEL_MAP = {
     # Standard tasks (70b model)
     "architect": ModelTier.STANDARD,
     "ansible": ModelTier.STANDARD,
+})
+_task_tier_get = TASK_MODEL_MAP.get
+
+
+def _default_tier(task_name: str) -> ModelTier:
+    """
+    Static tier for a task. Callers pass lowercase literals, so the exact
+    lookup normally hits and task_name.lower() is only built on a miss.
+    """
+    tier = _task_tier_get(task_name)
+    if tier is None:
+        tier = _task_tier_get(task_name.lower(), ModelTier.STANDARD)
+    return tier
+
+
+# Adaptive routing: rolling per-(task, tier) statistics (EMA) used to score tiers.
+# The static map above is the prior. Only the running workflow's own retries
+# move a task off its default tier; the shared statistics merely shape when
+# that happens, so one user's failing prompts cannot reroute everyone else.
+ROUTER_EMA_ALPHA = 0.2           # Weight of the newest observation
+ROUTER_OFF_DEFAULT_PENALTY = 2.0 # Prior cost of using a tier the task does not default to
+ROUTER_RETRY_PENALTY = 0.5       # Extra cost per failed attempt on the default tier
+ROUTER_LATENCY_SCALE = 30.0      # Seconds; latency is a tie-breaker, not the main signal
+ROUTER_PROMPT_SCALE = 8000       # Characters; long prompts favour the larger model
+ROUTER_STARTUP_DECAY = 0.5       # Share of restored statistics kept (rest reverts to defaults)
+ROUTER_STATS_FILE = os.getenv("MODEL_ROUTER_STATS_FILE", "")
+
+_DEFAULT_TIER_STATS: Dict[ModelTier, Dict[str, float]] = {
+    ModelTier.LIGHTWEIGHT: {"latency_ema": 1.0, "success_ema": 0.8},
+    ModelTier.STANDARD: {"latency_ema": 4.0, "success_ema": 0.8},
 }
+_router_stats: Dict[Tuple[str, ModelTier], Dict[str, float]] = {}
+_router_lock = threading.Lock()
 
 
-def get_model_for_task(task_name: str) -> ModelTier:
+def _task_stats(task_name: str, tier: ModelTier) -> Dict[str, float]:
+    """Statistics for a task on a tier, seeded from the defaults (caller holds _router_lock)."""
+    stats = _router_stats.get((task_name, tier))
+    if stats is None:
+        stats = _router_stats[(task_name, tier)] = dict(_DEFAULT_TIER_STATS[tier])
+    return stats
+
+
+def score_tier(tier: ModelTier, task_name: str, retry_count: int, prompt_len: int) -> float:
+    """
+    Expected cost of running a task on a tier (lower is better).
+    
+    cost = prior * retry_penalty * prompt_penalty * (1 + latency/scale) / success
+    
+    - prior: 1.0 on the task's default tier, ROUTER_OFF_DEFAULT_PENALTY otherwise
+    - retry_penalty: grows with retry_count on the default tier, so repeated
+      failures on the same model eventually diversify to the other tier
+      (for the architect: on the second retry with the initial statistics)
+    - prompt_penalty: long prompts make the lightweight tier more expensive
+    - latency/success: this task's rolling statistics on the tier
+    """
+    default_tier = _default_tier(task_name)
+    
+    with _router_lock:
+        stats = dict(_task_stats(task_name, tier))
+    
+    cost = 1.0 if tier == default_tier else ROUTER_OFF_DEFAULT_PENALTY
+    if tier == default_tier:
+        cost *= 1 + ROUTER_RETRY_PENALTY * retry_count
+    if tier == ModelTier.LIGHTWEIGHT:
+        cost *= 1 + prompt_len / ROUTER_PROMPT_SCALE
+    cost *= 1 + stats["latency_ema"] / ROUTER_LATENCY_SCALE
+    
+    return cost / max(stats["success_ema"], 0.05)
+
+
+def get_model_for_task(task_name: str, state: Optional[Dict[str, Any]] = None) -> ModelTier:
     """
     Get recommended model tier for a specific task.
     
+    Without state, or on a workflow's first attempt, this is the static
+    TASK_MODEL_MAP lookup: shared statistics alone never reroute a fresh
+    workflow. Once the workflow has retried, every tier is scored with
+    score_tier() using its retry count and prompt length, and the cheapest
+    tier is returned.
+    
     Args:
         task_name: Name of the task (e.g., 'architect', 'planner')
+        state: Optional AgentState of the running workflow
         
     Returns:
         Recommended ModelTier
     """
-    return TASK_MODEL_MAP.get(task_name.lower(), ModelTier.STANDARD)
+    retry_count = state.get("retry_count", 0) if state is not None else 0
+    if retry_count == 0:
+        return _default_tier(task_name)
+    
+    prompt_len = len(state.get("user_prompt", ""))
+    
+    return min(ModelTier, key=lambda tier: score_tier(tier, task_name, retry_count, prompt_len))
+
+
+def record_llm_latency(task_name: str, tier: ModelTier, seconds: float) -> None:
+    """Fold one observed LLM call latency into the task's rolling average for the tier."""
+    with _router_lock:
+        stats = _task_stats(task_name, tier)
+        stats["latency_ema"] += ROUTER_EMA_ALPHA * (seconds - stats["latency_ema"])
+
+
+def record_llm_result(task_name: str, tier: ModelTier, success: bool) -> None:
+    """Fold one observed outcome (e.g. generated code validated) into the task's success rate."""
+    with _router_lock:
+        stats = _task_stats(task_name, tier)
+        stats["success_ema"] += ROUTER_EMA_ALPHA * ((1.0 if success else 0.0) - stats["success_ema"])
+
+
+def load_router_stats() -> None:
+    """
+    Restore router statistics from MODEL_ROUTER_STATS_FILE, if configured.
+    
+    Restored values are decayed towards the defaults (ROUTER_STARTUP_DECAY),
+    so a bad streak before a restart fades instead of persisting forever.
+    The file maps task -> tier -> statistics; entries for unknown tasks,
+    tiers or fields are ignored.
+    """
+    if not ROUTER_STATS_FILE or not os.path.exists(ROUTER_STATS_FILE):
+        return
+    
+    try:
+        with open(ROUTER_STATS_FILE, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        with _router_lock:
+            for task_name, tiers in saved.items():
+                if not isinstance(tiers, dict):
+                    continue
+                for tier in ModelTier:
+                    restored = tiers.get(tier.value)
+                    if not isinstance(restored, dict):
+                        continue
+                    stats = _task_stats(task_name, tier)
+                    for field, default in _DEFAULT_TIER_STATS[tier].items():
+                        if isinstance(restored.get(field), (int, float)):
+                            stats[field] = default + ROUTER_STARTUP_DECAY * (restored[field] - default)
+        logger.info(f"Loaded model router statistics from {ROUTER_STATS_FILE}")
+    except Exception as e:
+        logger.warning(f"Could not load model router statistics: {str(e)}")
+
+
+def save_router_stats() -> None:
+    """Persist router statistics to MODEL_ROUTER_STATS_FILE, if configured."""
+    if not ROUTER_STATS_FILE:
+        return
+    
+    try:
+        with _router_lock:
+            snapshot: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (task_name, tier), stats in _router_stats.items():
+                snapshot.setdefault(task_name, {})[tier.value] = dict(stats)
+        with open(ROUTER_STATS_FILE, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        logger.info(f"Saved model router statistics to {ROUTER_STATS_FILE}")
+    except Exception as e:
+        logger.warning(f"Could not save model router statistics: {str(e)}")
+
+
+load_router_stats()
 
 
 # Convenience functions
@@ -0,0 +1,87 @@
+"""
+Single-Flight Call Deduplication
+
+This module coalesces concurrent identical calls: while one caller (the
+"leader") executes a call for a key, every other caller asking for the same
+key waits for and shares the leader's result instead of issuing its own.
+
+It complements the LLM response cache (llm_cache): the cache only helps once
+a response has been stored, whereas simultaneous identical requests (demo
+deployments, CI smoke tests) would all miss it and each pay for a full LLM
+inference. With single-flight, N concurrent identical calls cost one.
+
+Design Pattern: Thread-based, because LangGraph runs the synchronous agent
+nodes on executor threads; followers block on a concurrent.futures.Future.
+Errors propagate to every waiter, and the key is released as soon as the
+leader finishes, so later calls are never served stale results from here.
+"""
+
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def make_key(*parts: str) -> str:
+    """Build a compact, fixed-size key from the parts identifying a call."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Run fn() for key, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies the call (see make_key)
+            fn: Zero-argument callable performing the actual work
+
+        Returns:
+            fn's result, possibly produced by another thread's call
+
+        Raises:
+            Whatever fn raised - in the leader and in every waiting caller
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            logger.info("Joining identical in-flight call instead of issuing a new one")
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+# Shared instance for LLM invocations
+llm_flight = SingleFlight()
@@ -7,10 +7,13 @@ tracking the evolution of infrastructure code through generation, validation,
 and security scanning phases.
 
 Design Pattern: TypedDict provides compile-time type checking while maintaining
-runtime flexibility for the LangGraph state machine.
+runtime flexibility for the LangGraph state machine. Fields annotated with a
+reducer (typing.Annotated) are append channels: nodes return only their new
+entries and LangGraph merges them into the accumulated value.
 """
 
-from typing import TypedDict, Optional, List, Dict, Any
+import operator
+from typing import Annotated, TypedDict, Optional, List, Dict, Any
 
 
 class AgentState(TypedDict):
@@ -27,7 +30,7 @@ class AgentState(TypedDict):
         terraform_code (str): Current version of generated Terraform HCL code
             
         validation_error (Optional[str]): Human-readable error from terraform validate
-            or completeness check. Set by both validator_node and completeness_validator_node.
+            or completeness check. Set by validator_node, which runs both checks.
         
         completion_advice (Optional[str]): Detailed advice from completeness validator
             explaining which resources are missing and how to add them. Used by Architect
@@ -58,8 +61,18 @@ class AgentState(TypedDict):
             setup and the "Cost Assassin" cron job. Empty string initially.
         
         logs (List[str]): Ordered list of workflow events for real-time observability.
-            Each node appends success/failure messages. Enables streaming progress to UI.
-            Example: ["✅ Terraform syntax validation passed", "❌ Security scan found 2 violations"]
+            Append channel (operator.add reducer): each node returns only its own
+            new messages, e.g. {"logs": ["✅ Terraform syntax validation passed"]},
+            instead of copying the full history. Enables streaming progress to UI.
+        
+        architect_tier (str): ModelTier value the architect used for the current
+            terraform_code. The validator feeds its pass/fail result back to the
+            model router's success statistics for that tier.
+        
+        attempt_signatures (List[str]): Short digests of (terraform_code, error) for
+            every failed syntax validation. Append channel like logs. When the newest
+            signature was already seen, the architect produced identical code with an
+            identical error, so further retries are certain to fail and the run ends.
     
     Lifecycle:
         1. Initialize with user_prompt
@@ -100,7 +113,9 @@ class AgentState(TypedDict):
     cost_estimate: str
     ansible_playbook: str
     graph_data: dict  # Structured graph representation of parsed HCL
-    logs: List[str]  # Real-time workflow event log
+    logs: Annotated[List[str], operator.add]  # Real-time workflow event log (append-only)
+    attempt_signatures: Annotated[List[str], operator.add]  # Failed validation digests (append-only)
+    architect_tier: str  # Model tier that generated terraform_code
     
     # Phase 1: Planning and completeness tracking fields
     planned_components: List[Dict[str, Any]]  # List of required infrastructure components
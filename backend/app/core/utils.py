@@ -6,9 +6,14 @@ to avoid code duplication and maintain consistency.
 """
 
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Matches fenced output in one pass: the opening fence line (```hcl, ```yaml, ...),
+# the body, and - only if it sits on its own final line - the closing fence
+_FENCE_RE = re.compile(r"\A```[^\n]*(?:\n|\Z)(.*?)(?:(?<=\n)[^\S\n]*```|)\Z", re.DOTALL)
+
 
 def clean_llm_output(text: str, lang: str = "") -> str:
     """
@@ -38,21 +43,13 @@ def clean_llm_output(text: str, lang: str = "") -> str:
     """
     text = text.strip()
     
-    if not text.startswith("```"):
+    match = _FENCE_RE.match(text)
+    if match is None:
         return text
     
     logger.debug(f"Cleaning markdown fences from {lang} output")
     
-    lines = text.split("\n")
-    
-    # Remove first line (e.g., ```hcl or just ```)
-    lines = lines[1:]
-    
-    # Remove last line if it's a fence
-    if lines and lines[-1].strip() == "```":
-        lines = lines[:-1]
-    
-    cleaned = "\n".join(lines).strip()
+    cleaned = match.group(1).strip()
     logger.debug(f"Removed markdown fences - {len(text)} → {len(cleaned)} chars")
     
     return cleaned
@@ -14,12 +14,16 @@ The health endpoint executes subprocess calls to:
 This validates that the "DevOps Toolbox" container is correctly configured.
 """
 
+import asyncio
+import json
 import subprocess
 import os
+import time
 from typing import Dict, Any
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 import logging
 from dotenv import load_dotenv
@@ -43,40 +47,65 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Get allowed origins from environment variable or use defaults
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else [
+# Get allowed origins from environment variable or use defaults.
+# Exact origins are kept in a frozenset (O(1) membership per request).
+CORS_ORIGINS = frozenset(os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else [
     "http://localhost:3000",
     "http://localhost:3001",
     "http://127.0.0.1:3000",
     "http://127.0.0.1:3001",
     "https://infra-genie.vercel.app",
     "https://infra-genie-git-main-dhanushranga1s-projects.vercel.app",
-]
+])
+
+# Pattern for local dev servers on any port and this project's Vercel preview
+# deployments (infra-genie-git-<branch>-dhanushranga1s-projects.vercel.app),
+# compiled once by Starlette. Deliberately not *.vercel.app: credentials are
+# allowed, so arbitrary Vercel-hosted sites must not match.
+CORS_ORIGIN_REGEX = os.getenv(
+    "CORS_ORIGIN_REGEX",
+    r"https?://(localhost|127\.0\.0\.1):\d+"
+    r"|https://infra-genie(-git-[a-z0-9-]+-dhanushranga1s-projects)?\.vercel\.app"
+)
 
 # Log CORS origins for debugging
-logger.info(f"CORS configured for origins: {CORS_ORIGINS}")
+logger.info(f"CORS configured for origins: {sorted(CORS_ORIGINS)} (regex: {CORS_ORIGIN_REGEX})")
 
 # Configure CORS for frontend communication
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allow all headers
 )
 
+# Environment for tool version checks: inherited, but with the C locale
+_TOOL_CHECK_ENV = {**os.environ, "LC_ALL": "C"}
+
+# Tool versions do not change for the life of the container, so /health
+# results are reused for this many seconds instead of re-forking every tool
+# on each probe (liveness/readiness checks hit the endpoint every few seconds)
+HEALTH_CACHE_TTL_SECONDS = 60.0
+_health_cache: Dict[str, Any] = {"ts": 0.0, "data": None}
+
+from app.core.metrics import TOOL_CHECK_LATENCY
+
 # Include API routes
 from app.api.routes import router
 app.include_router(router)
 
 
-def     check_tool_version(command: list[str], tool_name: str) -> Dict[str, Any]:
+async def check_tool_version(command: list[str], tool_name: str) -> Dict[str, Any]:
     """
     Execute a CLI tool version check command and capture its output.
 
     This function runs a subprocess to verify that a DevOps tool is installed
     and accessible. It captures both stdout and stderr to provide detailed
-    diagnostic information.
+    diagnostic information. The subprocess is awaited via asyncio, so the
+    event loop keeps serving other requests and several checks can run
+    concurrently.
 
     Args:
         command (list[str]): The command to execute as a list of arguments.
@@ -91,37 +120,47 @@ def     check_tool_version(command: list[str], tool_name: str) -> Dict[str, Any]
             - error (str, optional): Error message if the tool failed
 
     Example:
-        >>> check_tool_version(["terraform", "--version"], "Terraform")
+        >>> await check_tool_version(["terraform", "--version"], "Terraform")
         {
             "installed": True,
             "version": "Terraform v1.7.0\non linux_amd64"
         }
     """
     try:
-        logger.info(f"Checking {tool_name} installation: {' '.join(command)}")
+        logger.debug("Checking %s installation: %s", tool_name, command)
         
-        # Execute the command and capture output
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=10,  # Prevent hanging processes
-            check=False   # Don't raise exception on non-zero exit codes
-        )
+        with TOOL_CHECK_LATENCY.labels(tool=tool_name).time():
+            # Execute the command and capture output (C locale: skips locale
+            # setup in the child, notably for Python-based checkov/ansible)
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=_TOOL_CHECK_ENV
+            )
+            
+            try:
+                # Prevent hanging processes
+                stdout_bytes, stderr_bytes = await asyncio.wait_for(process.communicate(), timeout=10)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise subprocess.TimeoutExpired(command, 10)
         
-        # Check if command executed successfully
-        if result.returncode == 0:
+        # Decode only the stream that is actually reported
+        if process.returncode == 0:
             # Prefer stdout, fallback to stderr (some tools output to stderr)
-            version_output = result.stdout.strip() or result.stderr.strip()
-            logger.info(f"{tool_name} check successful: {version_output.split(chr(10))[0]}")
+            version_output = (stdout_bytes.strip() or stderr_bytes.strip()).decode("utf-8", errors="replace")
+            logger.info("%s check successful: %s", tool_name, version_output.partition("\n")[0])
             
             return {
                 "installed": True,
                 "version": version_output
             }
         else:
-            error_msg = result.stderr.strip() or result.stdout.strip() or "Unknown error"
-            logger.error(f"{tool_name} check failed: {error_msg}")
+            error_bytes = stderr_bytes.strip() or stdout_bytes.strip()
+            error_msg = error_bytes.decode("utf-8", errors="replace") if error_bytes else "Unknown error"
+            logger.error("%s check failed: %s", tool_name, error_msg)
             
             return {
                 "installed": False,
@@ -169,7 +208,7 @@ async def health_check() -> JSONResponse:
     Health check endpoint that verifies the operational status of the backend
     service and validates the installation of all required DevOps tools.
 
-    This endpoint performs subprocess calls to check the following tools:
+    This endpoint performs concurrent subprocess calls to check the following tools:
     1. **Terraform** - Infrastructure as Code provisioning
     2. **Checkov** - Security and compliance policy scanner
     3. **Ansible** - Configuration management and automation
@@ -179,6 +218,9 @@ async def health_check() -> JSONResponse:
     regardless of individual tool statuses. This allows for diagnostic
     information even if some tools fail.
 
+    Results are cached for HEALTH_CACHE_TTL_SECONDS, so frequent probes are
+    answered from memory instead of spawning four processes each time.
+
     Returns:
         JSONResponse: A JSON object containing:
             - status (str): Overall service health ("healthy")
@@ -224,6 +266,10 @@ async def health_check() -> JSONResponse:
     """
     logger.info("Health check endpoint called")
     
+    cached = _health_cache["data"]
+    if cached is not None and time.monotonic() - _health_cache["ts"] < HEALTH_CACHE_TTL_SECONDS:
+        return JSONResponse(status_code=200, content=cached)
+    
     # Define the tools to check with their respective commands
     tools_to_check = {
         "terraform": {
@@ -244,15 +290,19 @@ async def health_check() -> JSONResponse:
         }
     }
     
-    # Check each tool
-    tools_status = {}
-    all_tools_installed = True
-    
-    for tool_key, tool_info in tools_to_check.items():
-        tool_status = check_tool_version(
+    # Check all tools concurrently: wall time is the slowest tool, not the sum
+    results = await asyncio.gather(*(
+        check_tool_version(
             command=tool_info["command"],
             tool_name=tool_info["name"]
         )
+        for tool_info in tools_to_check.values()
+    ))
+    
+    tools_status = {}
+    all_tools_installed = True
+    
+    for (tool_key, tool_info), tool_status in zip(tools_to_check.items(), results):
         tools_status[tool_key] = tool_status
         
         if not tool_status["installed"]:
@@ -273,12 +323,31 @@ async def health_check() -> JSONResponse:
     else:
         logger.warning("Health check passed with warnings: Some tools are not available")
     
+    _health_cache["data"] = response_data
+    _health_cache["ts"] = time.monotonic()
+    
     return JSONResponse(
         status_code=200,
         content=response_data
     )
 
 
+@app.get(
+    "/metrics",
+    summary="Prometheus Metrics",
+    description="Exposes tool-check latency and LLM usage counters in Prometheus text format",
+    tags=["Health"]
+)
+async def metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Returns:
+        Response: All registered metrics in the Prometheus exposition format.
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get(
     "/",
     summary="Root Endpoint",
@@ -321,6 +390,45 @@ class TestGenerateResponse(BaseModel):
     is_clean: bool
 
 
+def _to_test_response(result: Dict[str, Any]) -> TestGenerateResponse:
+    """Build the /test/generate response body from a final workflow state."""
+    return TestGenerateResponse(
+        success=result["is_clean"],
+        terraform_code=result["terraform_code"],
+        validation_error=result.get("validation_error"),
+        security_errors=result.get("security_errors", []),
+        retry_count=result["retry_count"],
+        is_clean=result["is_clean"]
+    )
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _stream_test_generate(prompt: str):
+    """
+    Run the workflow and yield it as SSE frames: log events while nodes
+    finish, then a single done (or error) event with the final result.
+    """
+    try:
+        # Import here to avoid startup errors if dependencies not installed
+        from app.core.graph import astream_workflow
+    except ImportError as e:
+        logger.error(f"Failed to import workflow: {str(e)}")
+        yield _sse_event("error", json.dumps({"detail": f"Workflow system not available. Missing dependencies: {str(e)}"}))
+        return
+    
+    async for event in astream_workflow(prompt):
+        if event["event"] == "log":
+            yield _sse_event("log", json.dumps({"node": event["node"], "message": event["message"]}))
+        else:
+            response = _to_test_response(event["state"])
+            logger.info(f"Streamed workflow completed. Success: {response.success}")
+            yield _sse_event("done", response.model_dump_json())
+
+
 @app.post(
     "/test/generate",
     response_model=TestGenerateResponse,
@@ -328,7 +436,7 @@ class TestGenerateResponse(BaseModel):
     description="Test endpoint to manually trigger the LangGraph workflow for development and debugging",
     tags=["Testing"]
 )
-async def test_generate(request: TestGenerateRequest) -> TestGenerateResponse:
+async def test_generate(request: TestGenerateRequest, http_request: Request):
     """
     Test endpoint for manually executing the infrastructure generation workflow.
     
@@ -340,10 +448,16 @@ async def test_generate(request: TestGenerateRequest) -> TestGenerateResponse:
     
     Args:
         request (TestGenerateRequest): Contains the user's infrastructure prompt
+        http_request (Request): Raw request, used for Accept negotiation
     
     Returns:
         TestGenerateResponse: Complete workflow state including generated code
             and any errors encountered
+        
+        If the client sends `Accept: text/event-stream`, the result is streamed
+        as Server-Sent Events instead: one `log` event per workflow log line as
+        nodes finish, then a `done` event whose data is the TestGenerateResponse
+        JSON (or an `error` event if the workflow cannot run).
     
     Example Request:
         ```bash
@@ -351,6 +465,14 @@ async def test_generate(request: TestGenerateRequest) -> TestGenerateResponse:
           -H "Content-Type: application/json" \
           -d '{"prompt": "Create a secure S3 bucket"}'
         ```
+        
+        Streaming:
+        ```bash
+        curl -N -X POST http://localhost:8000/test/generate \
+          -H "Content-Type: application/json" \
+          -H "Accept: text/event-stream" \
+          -d '{"prompt": "Create a secure S3 bucket"}'
+        ```
     
     Example Response:
         ```json
@@ -371,23 +493,23 @@ async def test_generate(request: TestGenerateRequest) -> TestGenerateResponse:
     """
     logger.info(f"Test generation request received: {request.prompt[:50]}...")
     
+    if "text/event-stream" in http_request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream_test_generate(request.prompt),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
     try:
         # Import here to avoid startup errors if dependencies not installed
-        from app.core.graph import run_workflow
+        from app.core.graph import arun_workflow
         
         # Execute the workflow
         logger.info("Starting workflow execution...")
-        result = run_workflow(request.prompt)
+        result = await arun_workflow(request.prompt)
         
         # Format response
-        response = TestGenerateResponse(
-            success=result["is_clean"],
-            terraform_code=result["terraform_code"],
-            validation_error=result.get("validation_error"),
-            security_errors=result.get("security_errors", []),
-            retry_count=result["retry_count"],
-            is_clean=result["is_clean"]
-        )
+        response = _to_test_response(result)
         
         logger.info(f"Workflow completed. Success: {response.success}")
         return response
@@ -414,10 +536,31 @@ async def startup_event():
     """
     Application startup event handler.
     
-    Logs application startup and performs any necessary initialization.
+    Logs application startup and prewarms what the first request would
+    otherwise pay for: importing and compiling the LangGraph workflow,
+    constructing the cached Groq clients for both tiers, and populating the
+    /health tool-version cache. Failures are logged and ignored, so the API
+    still starts without credentials or tools (e.g. offline test mode).
     """
     logger.info("=" * 60)
     logger.info("InfraGenie Backend API starting up...")
+    
+    try:
+        from app.core.graph import get_workflow_app
+        from app.core.model_config import ModelConfig, ModelTier
+        
+        get_workflow_app()
+        ModelConfig.create_llm(ModelTier.LIGHTWEIGHT)
+        ModelConfig.create_llm(ModelTier.STANDARD)
+        logger.info("Workflow graph and LLM clients prewarmed")
+    except Exception as e:
+        logger.warning(f"Workflow prewarm skipped: {str(e)}")
+    
+    try:
+        await health_check()
+    except Exception as e:
+        logger.warning(f"Health cache prewarm skipped: {str(e)}")
+    
     logger.info("FastAPI application initialized successfully")
     logger.info("Documentation available at /docs")
     logger.info("=" * 60)
@@ -432,6 +575,10 @@ async def shutdown_event():
     Performs cleanup tasks before the application terminates.
     """
     logger.info("InfraGenie Backend API shutting down...")
+    
+    # Keep the model router's learned statistics across restarts (if configured)
+    from app.core.model_config import save_router_stats
+    save_router_stats()
     logger.info("Cleanup completed successfully")
 
 
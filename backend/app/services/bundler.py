@@ -9,16 +9,45 @@ The bundler creates a complete, self-contained package that users can download
 and execute to provision their infrastructure with a single command.
 """
 
+import copy
+import hashlib
 import io
+import os
+import string
+import tarfile
+import threading
+import time
 import zipfile
-from typing import Dict, Any
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterator, Literal, Optional, Tuple
 import logging
 from datetime import datetime
 
 from app.core.state import AgentState
 
+try:
+    from isal import isal_zlib
+except ImportError:  # Optional: without it zipfile keeps the stdlib zlib
+    isal_zlib = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: without it only ZIP kits can be built
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Separator line for bundler log output
+BANNER = "=" * 60
+
+# Deflate implementation used by the bundler: isal_zlib is a drop-in zlib
+# replacement backed by ISA-L whose vectorized deflate runs several times
+# faster at low levels. The output is still standard raw deflate that any
+# unzip tool reads. It is applied per member (see _write_member), never by
+# patching the zipfile module, so other zipfile users keep the stdlib zlib.
+_zlib = isal_zlib if isal_zlib is not None else zlib
+
 
 # README template for the deployment kit
 README_TEMPLATE = """# InfraGenie Deployment Kit
@@ -41,10 +70,13 @@ Everything is automated - just run one script and provide your AWS credentials!
 
 ## 🚀 Quick Start (2 Steps!)
 
-### Step 1: Make Script Executable (One-Time)
+### Step 1: Make Scripts Executable (If Needed)
+
+`deploy.sh` and `destroy.sh` ship with executable permissions, which `unzip`
+and `tar` keep. Only if your extraction tool dropped them:
 
 ```bash
-chmod +x deploy.sh
+chmod +x deploy.sh destroy.sh
 ```
 
 ### Step 2: Deploy Everything
@@ -313,13 +345,13 @@ DEPLOY_SCRIPT_TEMPLATE = """#!/bin/bash
 set -e  # Exit on error
 
 # Colors for output
-GREEN='\\033[0;32m'
-YELLOW='\\033[1;33m'
-RED='\\033[0;31m'
-BLUE='\\033[0;34m'
-CYAN='\\033[0;36m'
-MAGENTA='\\033[0;35m'
-NC='\\033[0m' # No Color
+GREEN=$'\\033[0;32m'
+YELLOW=$'\\033[1;33m'
+RED=$'\\033[0;31m'
+BLUE=$'\\033[0;34m'
+CYAN=$'\\033[0;36m'
+MAGENTA=$'\\033[0;35m'
+NC=$'\\033[0m' # No Color
 
 # Detect best dialog tool available
 if command -v dialog &> /dev/null; then
@@ -1060,10 +1092,10 @@ DESTROY_SCRIPT_TEMPLATE = """#!/bin/bash
 set -e
 
 # Colors for output
-GREEN='\\033[0;32m'
-YELLOW='\\033[1;33m'
-RED='\\033[0;31m'
-NC='\\033[0m' # No Color
+GREEN=$'\\033[0;32m'
+YELLOW=$'\\033[1;33m'
+RED=$'\\033[0;31m'
+NC=$'\\033[0m' # No Color
 
 echo "⚠️  ================================================"
 echo "     INFRASTRUCTURE DESTRUCTION"
@@ -1129,7 +1161,444 @@ echo "Thank you for using InfraGenie! 👋"
 """
 
 
-def create_deployment_kit(state: AgentState) -> io.BytesIO:
+# Ansible inventory template shipped with every kit
+INVENTORY_TEMPLATE = """# Ansible Inventory
+# This file will be populated automatically by deploy.sh
+# Or manually add your server IPs here:
+
+[servers]
+# your-server-ip ansible_user=ubuntu
+"""
+
+# Static members encoded once at import; writestr would otherwise re-encode
+# ~30 KB of script text to UTF-8 on every download
+_DEPLOY_SCRIPT_BYTES = DEPLOY_SCRIPT_TEMPLATE.encode("utf-8")
+_DESTROY_SCRIPT_BYTES = DESTROY_SCRIPT_TEMPLATE.encode("utf-8")
+_INVENTORY_BYTES = INVENTORY_TEMPLATE.encode("utf-8")
+
+# README_TEMPLATE pre-parsed once into (UTF-8 literal bytes, field name)
+# pairs, so a render is a single bytes join over the encoded values instead of
+# re-parsing the format string and encoding ~7 KB of text on every download.
+# Only the README has placeholders; the deploy and destroy scripts are static
+# and are written as-is.
+_README_CHUNKS = [
+    (literal.encode("utf-8"), field)
+    for literal, field, _, _ in string.Formatter().parse(README_TEMPLATE)
+]
+
+
+def _render_readme(**values: bytes) -> bytes:
+    """Render README_TEMPLATE from UTF-8 encoded values (same bytes as .format() then .encode())."""
+    out = []
+    for literal, field in _README_CHUNKS:
+        out.append(literal)
+        if field is not None:
+            out.append(values[field])
+    return b"".join(out)
+
+
+# Fixed member metadata. writestr(name, ...) would stamp every entry with the
+# current local time, so two builds of the same kit differed byte-for-byte;
+# with a fixed DOS epoch timestamp identical inputs give identical archives,
+# which is what makes the built-kit cache below safe. Prototypes are copied
+# per build because writestr fills in sizes/CRC/offsets on the ZipInfo.
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def _zip_info(name: str, mode: int) -> zipfile.ZipInfo:
+    """Build a ZipInfo prototype with a fixed timestamp and Unix permissions."""
+    info = zipfile.ZipInfo(name, date_time=_ZIP_EPOCH)
+    info.external_attr = mode << 16
+    return info
+
+
+_ZIP_INFOS = {
+    "main.tf": _zip_info("main.tf", 0o644),
+    "playbook.yml": _zip_info("playbook.yml", 0o644),
+    "deploy.sh": _zip_info("deploy.sh", 0o755),  # executable
+    "destroy.sh": _zip_info("destroy.sh", 0o755),  # executable
+    "README.md": _zip_info("README.md", 0o644),
+    "inventory.ini": _zip_info("inventory.ini", 0o644),
+}
+
+# Deflate level of the default ("fast") tier: 1 = fastest, 6 = balanced,
+# 9 = smallest. For a one-shot bundle of a few KB of text, level 1 keeps
+# nearly all of level 6's ratio at a fraction of the CPU cost; deployments
+# that archive kits can raise it without passing ?mode= on every download.
+DEFAULT_ZIP_COMPRESS_LEVEL = 1
+
+
+def _zip_level_from_env() -> int:
+    """
+    Read INFRAGENIE_ZIP_LEVEL, falling back instead of failing the import.
+
+    A non-integer value logs a warning and uses DEFAULT_ZIP_COMPRESS_LEVEL;
+    an out-of-range one is clamped to 0-9, so a typo in the environment never takes the API down or first surfaces
+    as a failed download.
+    """
+    raw = os.getenv("INFRAGENIE_ZIP_LEVEL", "").strip()
+    if not raw:
+        return DEFAULT_ZIP_COMPRESS_LEVEL
+    
+    try:
+        level = int(raw)
+    except ValueError:
+        logger.warning(
+            f"Invalid INFRAGENIE_ZIP_LEVEL={raw!r}, using {DEFAULT_ZIP_COMPRESS_LEVEL}"
+        )
+        return DEFAULT_ZIP_COMPRESS_LEVEL
+    
+    clamped = min(max(level, 0), 9)
+    if clamped != level:
+        logger.warning(f"INFRAGENIE_ZIP_LEVEL={level} is out of range 0-9, using {clamped}")
+    return clamped
+
+
+ZIP_COMPRESS_LEVEL = _zip_level_from_env()
+
+# Compression tiers selectable per download: mode -> (member method, level).
+# LZMA ("archive") is smallest but slowest, and has no level in zipfile.
+# Deflate levels 0-3 run on ISA-L when it is installed, higher ones (such as
+# "balanced") on the stdlib zlib, so every tier compresses at its stated level.
+KitMode = Literal["fast", "balanced", "archive"]
+KIT_MODES: Dict[str, Tuple[int, Optional[int]]] = {
+    "fast": (zipfile.ZIP_DEFLATED, ZIP_COMPRESS_LEVEL),
+    "balanced": (zipfile.ZIP_DEFLATED, 6),
+    "archive": (zipfile.ZIP_LZMA, None),
+}
+
+
+def _kit_method(mode: str, compression: Optional[int]) -> Tuple[int, Optional[int]]:
+    """
+    Resolve the (method, level) for a build.
+
+    An explicit compression method overrides the mode's (the HTTP layer asks
+    for ZIP_STORED when it compresses the whole archive itself). Levels are
+    used as given: ISA-L handles 0-3, higher ones use the stdlib zlib (see
+    _isal_handles).
+    """
+    method, level = KIT_MODES[mode]
+    if compression is not None and compression != method:
+        method, level = compression, (ZIP_COMPRESS_LEVEL if compression == zipfile.ZIP_DEFLATED else None)
+    return method, level
+
+
+# Built kits, keyed by a digest of everything that goes into them. Demo and
+# testing flows re-download the same kit repeatedly; a hit is a dict lookup
+# instead of CRC32 + deflate over ~40 KB. A hit serves the archive exactly as
+# first built, so the README's "Generated" timestamp is that of the first
+# build of this content.
+KIT_CACHE_MAX_ENTRIES = 64
+
+# Kits larger than this are never cached, so a burst of unusually large
+# kits cannot pin tens of MB in the heap; it also lets the streaming path
+# drop chunks once sent instead of holding the whole archive
+KIT_CACHE_MAX_KIT_BYTES = 512 * 1024
+_kit_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_kit_cache_lock = threading.Lock()
+
+
+def _kit_key(*parts: bytes, compression: int, level: Optional[int]) -> str:
+    """Digest the encoded kit inputs (NUL-separated so fields cannot run together)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\0")
+    digest.update(f"{compression}:{level}".encode("ascii"))
+    return digest.hexdigest()
+
+
+# Members whose first KB deflates to more than this fraction of its size are
+# stored instead: deflating already-compressed or random data (binary
+# payloads, inlined keys) burns CPU and can make the member larger
+DEFLATE_PROBE_BYTES = 1024
+DEFLATE_MIN_SAVING_RATIO = 0.95
+
+# Members smaller than this are stored without probing: saving a few hundred
+# bytes on an inventory stub or a one-line placeholder is not worth a deflate
+# stream setup per member
+DEFLATE_MIN_MEMBER_BYTES = 2048
+
+
+def _member_compression(data: bytes, compression: int) -> int:
+    """Choose the method for one member: the archive's, unless deflate would not pay off."""
+    if compression != zipfile.ZIP_DEFLATED:
+        return compression
+    if len(data) < DEFLATE_MIN_MEMBER_BYTES:
+        return zipfile.ZIP_STORED
+    sample = data[:DEFLATE_PROBE_BYTES]
+    if len(_zlib.compress(sample, 1)) >= len(sample) * DEFLATE_MIN_SAVING_RATIO:
+        return zipfile.ZIP_STORED
+    return compression
+
+
+# Deflate decisions for the static members, taken once at import: their
+# content never changes, so probing them on every build is wasted work.
+# (The scripts deflate to about a quarter of their size, so they are not
+# stored; inventory.ini is under the size threshold and is.)
+_STATIC_DEFLATE_METHODS = {
+    "deploy.sh": _member_compression(_DEPLOY_SCRIPT_BYTES, zipfile.ZIP_DEFLATED),
+    "destroy.sh": _member_compression(_DESTROY_SCRIPT_BYTES, zipfile.ZIP_DEFLATED),
+    "inventory.ini": _member_compression(_INVENTORY_BYTES, zipfile.ZIP_DEFLATED),
+}
+
+
+def _isal_handles(level: Optional[int]) -> bool:
+    """
+    Whether ISA-L deflates at this level. It only has levels 0-3, so higher
+    ones (the "balanced" tier, INFRAGENIE_ZIP_LEVEL above 3) keep the stdlib
+    zlib instead of being silently capped.
+    """
+    return isal_zlib is not None and level is not None and level <= isal_zlib.ISAL_BEST_COMPRESSION
+
+
+def _write_member(zip_file: zipfile.ZipFile, name: str, data) -> None:
+    """
+    Write one member using a private copy of its ZipInfo prototype.
+
+    A ZipInfo does not inherit the archive's method and level, so both are
+    set on the copy; the method is chosen per member (see
+    _member_compression). Deflated members go through ISA-L when it
+    supports the level: the member's writer gets an isal_zlib compressor in
+    place of the stdlib one zipfile created, which keeps the engine swap
+    local to this write (CRC32 and framing stay with zipfile).
+    """
+    compression = zip_file.compression
+    if compression == zipfile.ZIP_DEFLATED and name in _STATIC_DEFLATE_METHODS:
+        compression = _STATIC_DEFLATE_METHODS[name]
+    else:
+        compression = _member_compression(data, compression)
+    
+    info = copy.copy(_ZIP_INFOS[name])
+    info.compress_type = compression
+    info._compresslevel = zip_file.compresslevel
+    info.file_size = len(data)
+    
+    with zip_file.open(info, mode="w") as dest:
+        if compression == zipfile.ZIP_DEFLATED and _isal_handles(zip_file.compresslevel):
+            dest._compressor = isal_zlib.compressobj(zip_file.compresslevel, zlib.DEFLATED, -15)
+        dest.write(data)
+
+
+# (epoch second, formatted README timestamp) for the most recent build; the
+# README only shows whole seconds, so bursts of builds within one second
+# share one datetime construction and strftime
+_ts_cache: Tuple[int, bytes] = (0, b"")
+
+
+def _readme_timestamp() -> bytes:
+    """Current UTC time as shown in the README, reformatted at most once per second."""
+    global _ts_cache
+    now = int(time.time())
+    cached = _ts_cache
+    if cached[0] != now:
+        cached = (now, datetime.utcfromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S UTC").encode("ascii"))
+        _ts_cache = cached
+    return cached[1]
+
+
+# Placeholder members for kits built without generated code, pre-encoded
+DEFAULT_TERRAFORM_BYTES = b"# No Terraform code generated\n"
+DEFAULT_PLAYBOOK_BYTES = b"---\n# No playbook generated\n"
+
+
+def _kit_inputs(state: AgentState) -> Tuple[bytes, bytes, bytes, bytes]:
+    """
+    Extract the kit inputs from state, substituting placeholders for missing code.
+
+    Each field is read once and encoded to UTF-8 once; the bytes feed the
+    cache key, the README and writestr (which then skips its own encode).
+    """
+    get = state.get
+    terraform_code = get("terraform_code")
+    ansible_playbook = get("ansible_playbook")
+    
+    # Validate required content
+    if terraform_code:
+        terraform_code = terraform_code.encode("utf-8")
+    else:
+        logger.warning("No Terraform code in state, using placeholder")
+        terraform_code = DEFAULT_TERRAFORM_BYTES
+    
+    if ansible_playbook:
+        ansible_playbook = ansible_playbook.encode("utf-8")
+    else:
+        logger.warning("No Ansible playbook in state, using placeholder")
+        ansible_playbook = DEFAULT_PLAYBOOK_BYTES
+    
+    return (
+        terraform_code,
+        ansible_playbook,
+        str(get("cost_estimate", "Unknown")).encode("utf-8"),
+        str(get("user_prompt", "Infrastructure deployment")).encode("utf-8"),
+    )
+
+
+def _kit_cache_get(key: str) -> Optional[bytes]:
+    """Return a previously built kit, marking it most recently used."""
+    with _kit_cache_lock:
+        cached = _kit_cache.get(key)
+        if cached is not None:
+            _kit_cache.move_to_end(key)
+    return cached
+
+
+def _kit_cache_put(key: str, data: bytes) -> None:
+    """Store a built kit, evicting the least recently used one if full."""
+    if len(data) > KIT_CACHE_MAX_KIT_BYTES:
+        return
+    with _kit_cache_lock:
+        _kit_cache[key] = data
+        if len(_kit_cache) > KIT_CACHE_MAX_ENTRIES:
+            _kit_cache.popitem(last=False)
+
+
+def _write_static_members(zip_file: zipfile.ZipFile) -> Iterator[None]:
+    """Write the members that are identical in every kit, yielding after each one."""
+    # Add deploy.sh with executable permissions
+    logger.debug("Adding deploy.sh to kit...")
+    _write_member(zip_file, 'deploy.sh', _DEPLOY_SCRIPT_BYTES)
+    yield
+    
+    # Add destroy.sh with executable permissions
+    logger.debug("Adding destroy.sh to kit...")
+    _write_member(zip_file, 'destroy.sh', _DESTROY_SCRIPT_BYTES)
+    yield
+    
+    # Add empty inventory.ini template
+    logger.debug("Adding inventory.ini template to kit...")
+    _write_member(zip_file, 'inventory.ini', _INVENTORY_BYTES)
+    yield
+
+
+def _write_request_members(
+    zip_file: zipfile.ZipFile,
+    terraform_code: bytes,
+    ansible_playbook: bytes,
+    cost_estimate: bytes,
+    user_prompt: bytes
+) -> Iterator[None]:
+    """Write the members generated for this request, yielding after each one."""
+    # Add main.tf
+    logger.debug("Adding main.tf to kit...")
+    _write_member(zip_file, 'main.tf', terraform_code)
+    yield
+    
+    # Add playbook.yml
+    logger.debug("Adding playbook.yml to kit...")
+    _write_member(zip_file, 'playbook.yml', ansible_playbook)
+    yield
+    
+    # Add README.md
+    logger.debug("Adding README.md to kit...")
+    readme_content = _render_readme(
+        timestamp=_readme_timestamp(),
+        cost=cost_estimate,
+        user_prompt=user_prompt
+    )
+    _write_member(zip_file, 'README.md', readme_content)
+    yield
+
+
+def _write_kit_members(
+    zip_file: zipfile.ZipFile,
+    terraform_code: bytes,
+    ansible_playbook: bytes,
+    cost_estimate: bytes,
+    user_prompt: bytes
+) -> Iterator[None]:
+    """
+    Write the kit members into zip_file, yielding after each one.
+
+    The pauses let stream_deployment_kit ship each member's bytes as soon as
+    they are written. Static members come first, so the buffered path can
+    start from a prebuilt skeleton (see _kit_skeleton) with the same layout.
+    """
+    yield from _write_static_members(zip_file)
+    yield from _write_request_members(
+        zip_file, terraform_code, ansible_playbook, cost_estimate, user_prompt
+    )
+
+
+# Prebuilt archives holding only the static members, one per (method, level)
+# in use. deploy.sh and destroy.sh are the bulk of every kit, so starting a
+# build from a copy of the skeleton and appending the request's members skips
+# their CRC32 and deflate entirely; zipfile's append mode only rewrites the
+# central directory. At most a handful of entries exist (one per kit mode).
+_kit_skeletons: Dict[Tuple[int, Optional[int]], bytes] = {}
+_kit_skeletons_lock = threading.Lock()
+
+
+def _kit_skeleton(method: int, level: Optional[int]) -> bytes:
+    """Return the static-members archive for this method/level, building it once."""
+    skeleton = _kit_skeletons.get((method, level))
+    if skeleton is not None:
+        return skeleton
+    
+    with _kit_skeletons_lock:
+        skeleton = _kit_skeletons.get((method, level))
+        if skeleton is None:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', compression=method, compresslevel=level) as zip_file:
+                for _ in _write_static_members(zip_file):
+                    pass
+            skeleton = buffer.getvalue()
+            _kit_skeletons[(method, level)] = skeleton
+    return skeleton
+
+
+def _error_kit(e: Exception) -> io.BytesIO:
+    """Build the minimal ZIP returned when kit generation fails."""
+    error_zip = io.BytesIO()
+    with zipfile.ZipFile(error_zip, 'w') as zf:
+        zf.writestr(
+            _zip_info('ERROR.txt', 0o644),
+            f"Failed to create deployment kit: {str(e)}"
+        )
+    error_zip.seek(0)
+    return error_zip
+
+
+# Streamed kits are sent in chunks of at least this size (except the last):
+# small members (inventory, placeholders) would otherwise each cost a
+# separate ASGI send and socket write
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class _ChunkSink:
+    """
+    Write-only file object that collects ZipFile output until drained.
+
+    It deliberately has no tell()/seek(), so ZipFile treats it as an
+    unseekable stream: it never goes back to patch local headers and instead
+    writes sizes and CRC in data descriptors after each member.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write(self, data) -> int:
+        self._buf += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        chunk = bytes(self._buf)
+        self._buf.clear()
+        return chunk
+
+
+def create_deployment_kit(
+    state: AgentState,
+    compression: Optional[int] = None,
+    mode: KitMode = "fast"
+) -> io.BytesIO:
     """
     Create a complete deployment kit ZIP archive from the workflow state.
     
@@ -1142,6 +1611,12 @@ def create_deployment_kit(state: AgentState) -> io.BytesIO:
             - ansible_playbook: Generated Ansible YAML
             - cost_estimate: Monthly cost string
             - user_prompt: Original request
+        compression (int, optional): zipfile compression method overriding
+            the mode's, e.g. ZIP_STORED when the HTTP layer compresses the
+            whole archive (zstd content encoding), so the payload is not
+            compressed twice.
+        mode (str): Compression tier (see KIT_MODES): "fast" (default,
+            deflate level 1), "balanced" (deflate level 6) or "archive" (LZMA).
     
     Returns:
         io.BytesIO: In-memory ZIP file ready for download/streaming
@@ -1177,94 +1652,268 @@ def create_deployment_kit(state: AgentState) -> io.BytesIO:
         ```
     
     Implementation:
-        - Uses in-memory BytesIO for efficiency
+        - Wraps build_deployment_kit's bytes in BytesIO (no copy)
+        - Deflates at level 1 by default (fast; near-identical size for small
+          text files); "balanced"/"archive" modes trade CPU for size, and
+          members are stored when the caller requests ZIP_STORED
         - Sets proper file permissions (deploy.sh as executable)
+        - Fixed member timestamps, so identical inputs build identical
+          archives; built kits are cached (LRU) by a digest of the inputs
         - Includes timestamp for traceability
         - Formats README with user context
         - Validates all required fields present
     """
-    logger.info("=" * 60)
-    logger.info("BUNDLER: Creating deployment kit")
+    # BytesIO over immutable bytes shares them until written, so wrapping the
+    # built (or cached) archive costs no copy
+    return io.BytesIO(build_deployment_kit(state, compression=compression, mode=mode))
+
+
+def build_deployment_kit(
+    state: AgentState,
+    compression: Optional[int] = None,
+    mode: KitMode = "fast"
+) -> bytes:
+    """
+    Build the deployment kit ZIP archive and return it as bytes.
     
-    # Extract state components
-    terraform_code = state.get("terraform_code", "")
-    ansible_playbook = state.get("ansible_playbook", "")
-    cost_estimate = state.get("cost_estimate", "Unknown")
-    user_prompt = state.get("user_prompt", "Infrastructure deployment")
+    The archive behind create_deployment_kit, for callers that need the raw
+    bytes (transport compression, Content-Length, hashing) rather than a
+    file object; it avoids the getvalue() copy of a returned buffer.
     
-    # Validate required content
-    if not terraform_code:
-        logger.warning("No Terraform code in state, using placeholder")
-        terraform_code = "# No Terraform code generated\n"
+    Args:
+        state (AgentState): Workflow state (see create_deployment_kit)
+        compression (int, optional): Method overriding the mode's
+        mode (str): Compression tier (see KIT_MODES)
     
-    if not ansible_playbook:
-        logger.warning("No Ansible playbook in state, using placeholder")
-        ansible_playbook = "---\n# No playbook generated\n"
+    Returns:
+        bytes: The complete ZIP archive (the ERROR.txt archive on failure)
+    """
+    logger.info(BANNER)
+    logger.info("BUNDLER: Creating deployment kit")
+    
+    terraform_code, ansible_playbook, cost_estimate, user_prompt = _kit_inputs(state)
+    method, level = _kit_method(mode, compression)
     
-    # Create in-memory ZIP file
-    zip_buffer = io.BytesIO()
+    key = _kit_key(
+        terraform_code, ansible_playbook, cost_estimate, user_prompt,
+        compression=method, level=level
+    )
+    cached = _kit_cache_get(key)
+    if cached is not None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"✓ Deployment kit served from cache ({len(cached) / 1024:.2f} KB)")
+        return cached
     
     try:
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            
-            # Add main.tf
-            logger.info("Adding main.tf to kit...")
-            zip_file.writestr('main.tf', terraform_code)
-            
-            # Add playbook.yml
-            logger.info("Adding playbook.yml to kit...")
-            zip_file.writestr('playbook.yml', ansible_playbook)
-            
-            # Add deploy.sh with executable permissions
-            logger.info("Adding deploy.sh to kit...")
-            deploy_info = zipfile.ZipInfo('deploy.sh')
-            deploy_info.external_attr = 0o755 << 16  # Unix executable permissions
-            zip_file.writestr(deploy_info, DEPLOY_SCRIPT_TEMPLATE)
-            
-            # Add destroy.sh with executable permissions
-            logger.info("Adding destroy.sh to kit...")
-            destroy_info = zipfile.ZipInfo('destroy.sh')
-            destroy_info.external_attr = 0o755 << 16  # Unix executable permissions
-            zip_file.writestr(destroy_info, DESTROY_SCRIPT_TEMPLATE)
-            
-            # Add README.md
-            logger.info("Adding README.md to kit...")
-            readme_content = README_TEMPLATE.format(
-                timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
-                cost=cost_estimate,
-                user_prompt=user_prompt
-            )
-            zip_file.writestr('README.md', readme_content)
-            
-            # Add empty inventory.ini template
-            logger.info("Adding inventory.ini template to kit...")
-            inventory_template = """# Ansible Inventory
-# This file will be populated automatically by deploy.sh
-# Or manually add your server IPs here:
-
-[servers]
-# your-server-ip ansible_user=ubuntu
-"""
-            zip_file.writestr('inventory.ini', inventory_template)
+        # Start from a copy of the static-members skeleton and append the
+        # request's members after them
+        zip_buffer = io.BytesIO(_kit_skeleton(method, level))
+        with zipfile.ZipFile(zip_buffer, 'a', compression=method, compresslevel=level) as zip_file:
+            for _ in _write_request_members(
+                zip_file, terraform_code, ansible_playbook, cost_estimate, user_prompt
+            ):
+                pass
         
-        # Get file count and size
-        zip_buffer.seek(0, 2)  # Seek to end
-        zip_size = zip_buffer.tell()
-        zip_buffer.seek(0)  # Reset to start
+        # getvalue() hands over the buffer's bytes without copying, as long as
+        # no other view of the buffer exists
+        kit = zip_buffer.getvalue()
         
-        logger.info(f"✓ Deployment kit created successfully")
-        logger.info(f"  - Size: {zip_size / 1024:.2f} KB")
-        logger.info(f"  - Files: main.tf, playbook.yml, deploy.sh, destroy.sh, README.md, inventory.ini")
+        # f-strings are formatted before logging checks the level, so skip
+        # building them when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Deployment kit created successfully")
+            logger.info(f"  - Size: {len(kit) / 1024:.2f} KB")
+            logger.info("  - Files: deploy.sh, destroy.sh, inventory.ini, main.tf, playbook.yml, README.md")
         
-        return zip_buffer
+        _kit_cache_put(key, kit)
+        
+        return kit
     
     except Exception as e:
         logger.error(f"Error creating deployment kit: {str(e)}")
         logger.exception("Full traceback:")
         
         # Return a minimal ZIP with error info
-        error_zip = io.BytesIO()
-        with zipfile.ZipFile(error_zip, 'w') as zf:
-            zf.writestr('ERROR.txt', f"Failed to create deployment kit: {str(e)}")
-        error_zip.seek(0)
-        return error_zip
+        return _error_kit(e).getvalue()
+
+
+def stream_deployment_kit(
+    state: AgentState,
+    compression: Optional[int] = None,
+    mode: KitMode = "fast"
+) -> Iterator[bytes]:
+    """
+    Generate the deployment kit ZIP as a sequence of byte chunks.
+    
+    Same archive contents as create_deployment_kit, but bytes are yielded as
+    soon as STREAM_CHUNK_BYTES of members have been written, so an HTTP
+    response can start sending before the whole archive has been built.
+    
+    Args:
+        state (AgentState): Workflow state (see create_deployment_kit)
+        compression (int, optional): Method overriding the mode's
+        mode (str): Compression tier (see KIT_MODES)
+    
+    Yields:
+        bytes: Consecutive chunks of the ZIP archive, each at least
+            STREAM_CHUNK_BYTES except the last (a large member is one chunk)
+    
+    Example:
+        ```python
+        return StreamingResponse(
+            stream_deployment_kit(state),
+            media_type="application/zip",
+            headers={"Content-Disposition": "attachment; filename=deployment-kit.zip"}
+        )
+        ```
+    
+    Note:
+        The archive is written as a non-seekable stream, so members carry
+        data descriptors instead of back-patched local headers; every unzip
+        tool handles both. Chunks are kept until the end to populate the
+        kit cache, unless the kit outgrows KIT_CACHE_MAX_KIT_BYTES (then
+        they are dropped once sent, so memory stays at about one member);
+        a cached kit is yielded in one piece. If generation
+        fails before anything is sent, the ERROR.txt archive is yielded
+        instead; after that the stream is aborted.
+    """
+    logger.info(BANNER)
+    logger.info("BUNDLER: Streaming deployment kit")
+    
+    terraform_code, ansible_playbook, cost_estimate, user_prompt = _kit_inputs(state)
+    method, level = _kit_method(mode, compression)
+    
+    # Streamed archives differ in layout from buffered ones, so they get their
+    # own cache entries
+    key = _kit_key(
+        terraform_code, ansible_playbook, cost_estimate, user_prompt, b"stream",
+        compression=method, level=level
+    )
+    cached = _kit_cache_get(key)
+    if cached is not None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"✓ Deployment kit served from cache ({len(cached) / 1024:.2f} KB)")
+        yield cached
+        return
+    
+    sink = _ChunkSink()
+    chunks: Optional[list] = []  # None once the kit is too large to cache
+    zip_size = 0
+    
+    try:
+        with zipfile.ZipFile(sink, 'w', compression=method, compresslevel=level) as zip_file:
+            for _ in _write_kit_members(
+                zip_file, terraform_code, ansible_playbook, cost_estimate, user_prompt
+            ):
+                if len(sink) < STREAM_CHUNK_BYTES:
+                    continue
+                chunk = sink.drain()
+                zip_size += len(chunk)
+                if zip_size > KIT_CACHE_MAX_KIT_BYTES:
+                    chunks = None
+                elif chunks is not None:
+                    chunks.append(chunk)
+                yield chunk
+        
+        # Remaining members plus the central directory, written on close
+        chunk = sink.drain()
+        zip_size += len(chunk)
+        if zip_size > KIT_CACHE_MAX_KIT_BYTES:
+            chunks = None
+        elif chunks is not None:
+            chunks.append(chunk)
+        yield chunk
+    
+    except Exception as e:
+        logger.error(f"Error streaming deployment kit: {str(e)}")
+        logger.exception("Full traceback:")
+        
+        if zip_size:
+            raise
+        yield _error_kit(e).getvalue()
+        return
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("✓ Deployment kit streamed successfully")
+        logger.info(f"  - Size: {zip_size / 1024:.2f} KB")
+    
+    if chunks is not None:
+        _kit_cache_put(key, b"".join(chunks))
+
+
+# zstd level for .tar.zst kits: level 3 is zstd's fast default and already
+# smaller than deflate level 6 on this text, at a fraction of the CPU
+KIT_TAR_ZSTD_LEVEL = 3
+
+# Fixed mtime for tarball members (same instant as _ZIP_EPOCH), so identical
+# inputs give identical tarballs
+_TAR_EPOCH = 315532800  # 1980-01-01T00:00:00Z
+
+
+def _tar_member(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    """Add one member with the same permissions as its ZIP counterpart."""
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mode = _ZIP_INFOS[name].external_attr >> 16
+    info.mtime = _TAR_EPOCH
+    tar.addfile(info, io.BytesIO(data))
+
+
+def build_deployment_tarball(state: AgentState) -> bytes:
+    """
+    Build the deployment kit as a zstd-compressed tarball (.tar.zst).
+    
+    Same members and permissions as the ZIP kit. The tar is compressed as a
+    whole, so zstd sees all members in one stream; it is typically both
+    faster to build and smaller than the per-member deflated ZIP, for
+    clients that can unpack it (tar --zstd, Linux and macOS).
+    
+    Args:
+        state (AgentState): Workflow state (see create_deployment_kit)
+    
+    Returns:
+        bytes: The .tar.zst archive
+    
+    Raises:
+        RuntimeError: If the optional zstandard package is not installed
+    """
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed; .tar.zst kits are unavailable")
+    
+    logger.info(BANNER)
+    logger.info("BUNDLER: Creating deployment kit tarball")
+    
+    terraform_code, ansible_playbook, cost_estimate, user_prompt = _kit_inputs(state)
+    
+    key = _kit_key(
+        terraform_code, ansible_playbook, cost_estimate, user_prompt, b"tar.zst",
+        compression=zipfile.ZIP_STORED, level=KIT_TAR_ZSTD_LEVEL
+    )
+    cached = _kit_cache_get(key)
+    if cached is not None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"✓ Deployment kit served from cache ({len(cached) / 1024:.2f} KB)")
+        return cached
+    
+    tar_buffer = io.BytesIO()
+    with tarfile.open(fileobj=tar_buffer, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        _tar_member(tar, "main.tf", terraform_code)
+        _tar_member(tar, "playbook.yml", ansible_playbook)
+        _tar_member(tar, "deploy.sh", _DEPLOY_SCRIPT_BYTES)
+        _tar_member(tar, "destroy.sh", _DESTROY_SCRIPT_BYTES)
+        _tar_member(tar, "README.md", _render_readme(
+            timestamp=_readme_timestamp(),
+            cost=cost_estimate,
+            user_prompt=user_prompt
+        ))
+        _tar_member(tar, "inventory.ini", _INVENTORY_BYTES)
+    
+    kit = zstandard.ZstdCompressor(level=KIT_TAR_ZSTD_LEVEL).compress(tar_buffer.getvalue())
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("✓ Deployment kit tarball created successfully")
+        logger.info(f"  - Size: {len(kit) / 1024:.2f} KB")
+    
+    _kit_cache_put(key, kit)
+    
+    return kit
@@ -18,9 +18,15 @@ The Solution:
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
 import re
 
+try:
+    import ahocorasick
+except ImportError:  # Optional: without it detection falls back to substring loops
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,6 +122,68 @@ INFRASTRUCTURE_PATTERNS = {
 }
 
 
+# A required resource after compilation: (types, display name, min_count)
+_Requirement = Tuple[Tuple[str, ...], str, int]
+# Per-provider requirements: provider -> (requirements, min_total_resources)
+_ProviderRequirements = Dict[str, Tuple[Tuple[_Requirement, ...], int]]
+
+
+def _compile_patterns() -> Tuple[Tuple[str, Tuple[str, ...], _ProviderRequirements], ...]:
+    """
+    Flatten INFRASTRUCTURE_PATTERNS into immutable lookup tuples, once.
+    
+    "a|b" type alternatives are pre-split and min_count defaults resolved,
+    so detection and validation never re-parse the table per request.
+    Pattern and keyword order is kept, which decides precedence.
+    
+    Returns:
+        Tuple of (pattern_name, keywords, {provider: (requirements, min_total)})
+    """
+    compiled = []
+    for name, pattern_def in INFRASTRUCTURE_PATTERNS.items():
+        providers = {}
+        for provider, spec in pattern_def.items():
+            if provider == "keywords":
+                continue
+            requirements = tuple(
+                (tuple(req["type"].split("|")), req["name"], req.get("min_count", 1))
+                for req in spec["required_resources"]
+            )
+            providers[provider] = (requirements, spec["min_total_resources"])
+        compiled.append((name, tuple(k.casefold() for k in pattern_def["keywords"]), providers))
+    return tuple(compiled)
+
+
+_COMPILED_PATTERNS = _compile_patterns()
+_PATTERN_PROVIDERS = {name: providers for name, _, providers in _COMPILED_PATTERNS}
+
+
+def _build_keyword_automaton():
+    """
+    Build an Aho-Corasick automaton over every pattern keyword, once.
+    
+    Each keyword maps to its (pattern index, keyword index) in
+    _COMPILED_PATTERNS so a scan can reproduce the loop's precedence:
+    the earliest pattern wins, then its earliest keyword.
+    
+    Returns:
+        ahocorasick.Automaton, or None if pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for pattern_index, (_, keywords, _) in enumerate(_COMPILED_PATTERNS):
+        for keyword_index, keyword in enumerate(keywords):
+            if not automaton.exists(keyword):
+                automaton.add_word(keyword, (pattern_index, keyword_index))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
 def detect_cloud_provider(code: str) -> str:
     """
     Detect which cloud provider is being used based on resource prefixes.
@@ -146,38 +214,64 @@ def detect_infrastructure_pattern(user_prompt: str) -> Optional[str]:
     Returns:
         Pattern key from INFRASTRUCTURE_PATTERNS or None
     """
-    prompt_lower = user_prompt.lower()
+    prompt_folded = user_prompt.casefold()
     
-    for pattern_name, pattern_def in INFRASTRUCTURE_PATTERNS.items():
-        for keyword in pattern_def["keywords"]:
-            if keyword in prompt_lower:
-                logger.info(f"Detected infrastructure pattern: {pattern_name} (keyword: {keyword})")
-                return pattern_name
+    if _KEYWORD_AUTOMATON is not None:
+        # One scan of the prompt finds every keyword; keep the highest-precedence hit
+        best = min((hit for _, hit in _KEYWORD_AUTOMATON.iter(prompt_folded)), default=None)
+        if best is not None:
+            pattern_name, keywords, _ = _COMPILED_PATTERNS[best[0]]
+            logger.info(f"Detected infrastructure pattern: {pattern_name} (keyword: {keywords[best[1]]})")
+            return pattern_name
+    else:
+        for pattern_name, keywords, _ in _COMPILED_PATTERNS:
+            for keyword in keywords:
+                if keyword in prompt_folded:
+                    logger.info(f"Detected infrastructure pattern: {pattern_name} (keyword: {keyword})")
+                    return pattern_name
     
     logger.info("No specific infrastructure pattern detected (generic request)")
     return None
 
 
+# Every `resource "<type>" "<name>"` header; the opening brace is captured
+# separately because only complete blocks count towards the total
+_RESOURCE_RE = re.compile(r'resource\s+"([^"]+)"\s+"[^"]+"(\s*{)?')
+
+
+def tally_resources(code: str) -> Tuple[Counter, int]:
+    """
+    Count resources by type, and resource blocks in total, in one pass.
+    
+    Args:
+        code: Terraform HCL code
+        
+    Returns:
+        (Counter of resource type -> count, total resource block count)
+    """
+    counts: Counter = Counter()
+    total = 0
+    for match in _RESOURCE_RE.finditer(code):
+        counts[match.group(1)] += 1
+        if match.group(2):
+            total += 1
+    return counts, total
+
+
 def count_resources(code: str, resource_type: str) -> int:
     """
     Count how many resources of a given type exist in the code.
-    Handles regex patterns for multiple types (e.g., "aws_lb|aws_alb").
+    Handles alternatives for multiple types (e.g., "aws_lb|aws_alb").
     
     Args:
         code: Terraform HCL code
-        resource_type: Resource type or regex pattern
+        resource_type: Resource type, or alternatives separated by |
         
     Returns:
         Count of matching resources
     """
-    # If resource_type contains |, treat as regex
-    if '|' in resource_type:
-        pattern = rf'resource\s+"({resource_type})"\s+"'
-    else:
-        pattern = rf'resource\s+"{re.escape(resource_type)}"\s+"'
-    
-    matches = re.findall(pattern, code)
-    return len(matches)
+    counts, _ = tally_resources(code)
+    return sum(counts[t] for t in resource_type.split("|"))
 
 
 def count_total_resources(code: str) -> int:
@@ -190,8 +284,8 @@ def count_total_resources(code: str) -> int:
     Returns:
         Total resource count
     """
-    matches = re.findall(r'resource\s+"[^"]+"\s+"[^"]+"\s*{', code)
-    return len(matches)
+    _, total = tally_resources(code)
+    return total
 
 
 def validate_completeness(user_prompt: str, terraform_code: str) -> Optional[str]:
@@ -233,24 +327,23 @@ def validate_completeness(user_prompt: str, terraform_code: str) -> Optional[str
         return "Could not determine cloud provider (no provider block found)"
     
     # Get requirements for this pattern + provider
-    pattern_def = INFRASTRUCTURE_PATTERNS[pattern]
+    pattern_def = _PATTERN_PROVIDERS[pattern]
     
     if provider not in pattern_def:
         logger.warning(f"No requirements defined for {pattern} on {provider}")
         return None  # Let it pass if we don't have requirements
     
-    requirements = pattern_def[provider]
+    requirements, min_total = pattern_def[provider]
+    
+    # Scan the code once; every requirement below is a dict lookup
+    resource_counts, total_resources = tally_resources(terraform_code)
     
     # Check each required resource
     missing_resources = []
     present_count = 0
     
-    for req in requirements["required_resources"]:
-        resource_type = req["type"]
-        resource_name = req["name"]
-        min_count = req.get("min_count", 1)
-        
-        actual_count = count_resources(terraform_code, resource_type)
+    for resource_types, resource_name, min_count in requirements:
+        actual_count = sum(resource_counts[t] for t in resource_types)
         
         if actual_count < min_count:
             if min_count > 1:
@@ -266,9 +359,6 @@ def validate_completeness(user_prompt: str, terraform_code: str) -> Optional[str
             logger.info(f"✓ Found {actual_count}x {resource_name}")
     
     # Check total resource count (sanity check)
-    total_resources = count_total_resources(terraform_code)
-    min_total = requirements["min_total_resources"]
-    
     logger.info(
         f"Resource count: {total_resources} total "
         f"(minimum: {min_total} for {pattern} on {provider})"
@@ -294,7 +384,7 @@ def validate_completeness(user_prompt: str, terraform_code: str) -> Optional[str
     # All checks passed
     logger.info(
         f"✓ Completeness validation passed: "
-        f"{len(requirements['required_resources'])} required components present, "
+        f"{len(requirements)} required components present, "
         f"{total_resources} total resources"
     )
     return None
@@ -305,7 +305,7 @@ def deep_validator_node(state: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "validation_error": "No Terraform code to validate",
             "planned_resources": 0,
-            "logs": state.get("logs", []) + ["❌ Deep validation skipped: No code"]
+            "logs": ["❌ Deep validation skipped: No code"]
         }
     
     # Run deep validation
@@ -321,7 +321,7 @@ def deep_validator_node(state: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "validation_error": None,  # No error - just skipped
             "planned_resources": 0,
-            "logs": state.get("logs", []) + [f"⚠ Deep validation skipped: {skipped_reason}"]
+            "logs": [f"⚠ Deep validation skipped: {skipped_reason}"]
         }
     
     if error:
@@ -332,12 +332,12 @@ def deep_validator_node(state: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "validation_error": truncated_error,
             "planned_resources": planned_resources,
-            "logs": state.get("logs", []) + [f"❌ Deep validation failed: {truncated_error}"]
+            "logs": [f"❌ Deep validation failed: {truncated_error}"]
         }
     else:
         logger.info(f"✓ Deep validation passed: {planned_resources} resources planned")
         return {
             "validation_error": None,
             "planned_resources": planned_resources,
-            "logs": state.get("logs", []) + [f"✅ Deep validation passed: {planned_resources} resources will be created"]
+            "logs": [f"✅ Deep validation passed: {planned_resources} resources will be created"]
         }
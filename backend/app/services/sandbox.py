@@ -12,20 +12,36 @@ Security Considerations:
 - Working directories are isolated per execution
 
 Design Pattern: Each function creates its own ephemeral workspace, ensuring
-thread-safety and preventing state pollution.
+thread-safety and preventing state pollution. Callers that run several tools
+on the same code can instead materialize it once with terraform_workspace()
+and pass the directory to each tool.
+
+Concurrency: validate_terraform and run_checkov are coroutines built on
+run_tool_async, so the workflow can run both scans at the same time without
+blocking the event loop.
 """
 
+import asyncio
+import contextlib
 import subprocess
 import tempfile
 import json
 import os
 import shutil
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import AsyncIterator, Iterator, Optional, List, Dict, Any
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Optional: non-POSIX hosts run init without the cache lock
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Lock file inside TF_PLUGIN_CACHE_DIR serialising `terraform init`
+PLUGIN_CACHE_LOCK_NAME = ".infragenie-init.lock"
+
 
 def run_tool(
     directory: str,
@@ -104,7 +120,142 @@ def run_tool(
         raise
 
 
-def validate_terraform(hcl_code: str) -> Optional[str]:
+async def run_tool_async(
+    directory: str,
+    command: List[str],
+    timeout: int = 60
+) -> subprocess.CompletedProcess:
+    """
+    Async counterpart of run_tool built on asyncio.create_subprocess_exec.
+    
+    The subprocess runs without holding the event loop, so several tools
+    (e.g. terraform and checkov) can execute concurrently via asyncio.gather.
+    Output is captured and decoded as UTF-8, and the result is returned as a
+    subprocess.CompletedProcess so callers can treat both variants alike.
+    
+    Args:
+        directory (str): Absolute path to the working directory
+        command (List[str]): Command and arguments as a list
+        timeout (int, optional): Maximum execution time in seconds. Default: 60.
+    
+    Returns:
+        subprocess.CompletedProcess: Exit code plus decoded stdout/stderr
+    
+    Raises:
+        subprocess.TimeoutExpired: If command exceeds timeout duration (the
+            child process is killed before raising)
+        FileNotFoundError: If the command executable is not found
+    """
+    logger.info(f"Executing command in {directory}: {' '.join(command)}")
+    
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=directory,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error(f"Command timed out after {timeout}s: {' '.join(command)}")
+            raise subprocess.TimeoutExpired(command, timeout)
+        
+        result = subprocess.CompletedProcess(
+            args=command,
+            returncode=process.returncode,
+            stdout=stdout.decode("utf-8", errors="replace"),
+            stderr=stderr.decode("utf-8", errors="replace")
+        )
+        
+        logger.debug(f"Command exit code: {result.returncode}")
+        if result.returncode != 0:
+            logger.warning(f"Command failed with stderr: {result.stderr[:200]}")
+        
+        return result
+    
+    except subprocess.TimeoutExpired:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error running command: {str(e)}")
+        raise
+
+
+@contextlib.contextmanager
+def terraform_workspace(hcl_code: str) -> Iterator[str]:
+    """
+    Materialize HCL code once in a temporary workspace shared by several tools.
+    
+    Writes the code to main.tf in a fresh temporary directory, yields the
+    directory path and removes it on exit. validate_terraform and run_checkov
+    both accept the yielded path via their `workspace` argument, so a
+    validation pass writes the code to disk once instead of once per tool.
+    
+    Example:
+        ```python
+        with terraform_workspace(code) as workspace:
+            error, violations = await asyncio.gather(
+                validate_terraform(code, workspace=workspace),
+                run_checkov(code, workspace=workspace)
+            )
+        ```
+    """
+    temp_dir = tempfile.mkdtemp(prefix="infragenie_tf_")
+    logger.info(f"Created shared Terraform workspace: {temp_dir}")
+    
+    try:
+        Path(temp_dir, "main.tf").write_text(hcl_code, encoding="utf-8")
+        yield temp_dir
+    finally:
+        try:
+            shutil.rmtree(temp_dir)
+            logger.debug(f"Cleaned up shared workspace: {temp_dir}")
+        except Exception as e:
+            logger.warning(f"Failed to cleanup {temp_dir}: {str(e)}")
+
+
+@contextlib.asynccontextmanager
+async def plugin_cache_lock() -> AsyncIterator[None]:
+    """
+    Hold an exclusive lock on the shared Terraform plugin cache.
+    
+    Terraform documents TF_PLUGIN_CACHE_DIR as unsafe for concurrent
+    writers, and every validation (parallel requests, batch runs) runs
+    `terraform init` against the same cache. A provider missing from it
+    would be downloaded into it by several processes at once, so inits are
+    serialised with an flock on a file in the cache directory. That covers
+    threads and uvicorn workers alike. With a warm cache, init only links
+    providers, so the lock is held briefly.
+    
+    A no-op when TF_PLUGIN_CACHE_DIR is unset or fcntl is unavailable.
+    """
+    cache_dir = os.getenv("TF_PLUGIN_CACHE_DIR")
+    if not cache_dir or fcntl is None:
+        yield
+        return
+    
+    try:
+        fd = os.open(os.path.join(cache_dir, PLUGIN_CACHE_LOCK_NAME), os.O_CREAT | os.O_RDWR, 0o644)
+    except OSError as e:
+        logger.warning(f"Could not open plugin cache lock, running init unlocked: {str(e)}")
+        yield
+        return
+    
+    try:
+        # Blocking acquire off the event loop; other workflows keep running
+        await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+async def validate_terraform(hcl_code: str, workspace: Optional[str] = None) -> Optional[str]:
     """
     Validate Terraform HCL code syntax and configuration correctness.
     
@@ -131,6 +282,9 @@ def validate_terraform(hcl_code: str) -> Optional[str]:
               instance_type = "t3.micro"
             }
             ```
+        workspace (Optional[str]): Directory from terraform_workspace() that
+            already contains hcl_code as main.tf. When given, no workspace is
+            created and the caller owns its cleanup.
     
     Returns:
         Optional[str]: 
@@ -153,7 +307,7 @@ def validate_terraform(hcl_code: str) -> Optional[str]:
         }
         '''
         
-        error = validate_terraform(code)
+        error = await validate_terraform(code)
         if error:
             print(f"Validation failed: {error}")
             # Send back to Architect Agent for fixing
@@ -167,26 +321,34 @@ def validate_terraform(hcl_code: str) -> Optional[str]:
         - Validation output is JSON-parsed for structured error extraction
         - Only the first error is returned to avoid overwhelming the LLM
         - The temp directory is deleted even if errors occur
+        - Providers are taken from TF_PLUGIN_CACHE_DIR when set (prewarmed in
+          the Docker image), so init does not re-download them per workspace;
+          inits are serialised on that cache (see plugin_cache_lock)
     """
     temp_dir = None
     
     try:
-        # Create isolated workspace
-        temp_dir = tempfile.mkdtemp(prefix="infragenie_tf_")
-        logger.info(f"Created temporary Terraform workspace: {temp_dir}")
+        if workspace is None:
+            # Create isolated workspace
+            temp_dir = tempfile.mkdtemp(prefix="infragenie_tf_")
+            logger.info(f"Created temporary Terraform workspace: {temp_dir}")
+            
+            # Write HCL code to main.tf
+            main_tf_path = Path(temp_dir) / "main.tf"
+            main_tf_path.write_text(hcl_code, encoding="utf-8")
+            logger.debug(f"Wrote {len(hcl_code)} bytes to {main_tf_path}")
         
-        # Write HCL code to main.tf
-        main_tf_path = Path(temp_dir) / "main.tf"
-        main_tf_path.write_text(hcl_code, encoding="utf-8")
-        logger.debug(f"Wrote {len(hcl_code)} bytes to {main_tf_path}")
+        tf_dir = workspace or temp_dir
         
-        # Initialize Terraform (download providers, modules)
+        # Initialize Terraform (download providers, modules); the shared
+        # plugin cache takes one writer at a time
         logger.info("Running terraform init...")
-        init_result = run_tool(
-            directory=temp_dir,
-            command=["terraform", "init", "-no-color"],
-            timeout=120  # Provider downloads can be slow
-        )
+        async with plugin_cache_lock():
+            init_result = await run_tool_async(
+                directory=tf_dir,
+                command=["terraform", "init", "-no-color"],
+                timeout=120  # Provider downloads can be slow
+            )
         
         if init_result.returncode != 0:
             error_msg = f"Terraform initialization failed: {init_result.stderr}"
@@ -197,8 +359,8 @@ def validate_terraform(hcl_code: str) -> Optional[str]:
         # Allow validate timeout to be configured via environment variable
         tf_validate_timeout = int(os.getenv("TF_VALIDATE_TIMEOUT", "120"))
         logger.info(f"Running terraform validate (timeout={tf_validate_timeout}s)...")
-        validate_result = run_tool(
-            directory=temp_dir,
+        validate_result = await run_tool_async(
+            directory=tf_dir,
             command=["terraform", "validate", "-json"],
             timeout=tf_validate_timeout
         )
@@ -254,13 +416,15 @@ def validate_terraform(hcl_code: str) -> Optional[str]:
                 logger.warning(f"Failed to cleanup {temp_dir}: {str(e)}")
 
 
-def run_checkov(hcl_code: str) -> List[Dict[str, str]]:
+async def run_checkov(hcl_code: str, workspace: Optional[str] = None) -> List[Dict[str, str]]:
     """
     Scan Terraform code for security and compliance violations using Checkov.
     Returns detailed violation information for intelligent remediation.
     
     Args:
         hcl_code (str): Terraform HCL code to scan
+        workspace (Optional[str]): Directory from terraform_workspace() that
+            already contains hcl_code as main.tf (caller owns cleanup)
     
     Returns:
         List[Dict[str, str]]: List of detailed violation dictionaries:
@@ -276,25 +440,28 @@ def run_checkov(hcl_code: str) -> List[Dict[str, str]]:
         ]
     
     Example:
-        violations = run_checkov(code)
+        violations = await run_checkov(code)
         for v in violations:
             print(f"{v['check_id']} on {v['resource']}: {v['check_name']}")
     """
     temp_dir = None
     
     try:
-        # Create isolated workspace
-        temp_dir = tempfile.mkdtemp(prefix="infragenie_checkov_")
-        logger.info(f"Created temporary Checkov workspace: {temp_dir}")
+        if workspace is None:
+            # Create isolated workspace
+            temp_dir = tempfile.mkdtemp(prefix="infragenie_checkov_")
+            logger.info(f"Created temporary Checkov workspace: {temp_dir}")
+            
+            # Write HCL code to main.tf
+            main_tf_path = Path(temp_dir) / "main.tf"
+            main_tf_path.write_text(hcl_code, encoding="utf-8")
         
-        # Write HCL code to main.tf
-        main_tf_path = Path(temp_dir) / "main.tf"
-        main_tf_path.write_text(hcl_code, encoding="utf-8")
+        scan_dir = workspace or temp_dir
         
         # Run Checkov with JSON output
         logger.info("Running Checkov security scan...")
-        checkov_result = run_tool(
-            directory=temp_dir,
+        checkov_result = await run_tool_async(
+            directory=scan_dir,
             command=[
                 "checkov",
                 "-f", "main.tf",
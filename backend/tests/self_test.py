@@ -10,9 +10,14 @@ It tests:
 2. Ansible playbook generation
 3. Deployment kit ZIP creation
 4. ZIP contents and structure
+5. Every kit mode and archive format round-trips
+6. Single-pass resource tally matches per-type counting
+7. Pattern detection agrees with the keyword loop, with or without Aho-Corasick
 """
 
 import io
+import re
+import tarfile
 import zipfile
 import sys
 from typing import Dict, Any
@@ -22,7 +27,22 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.core.state import AgentState
-from app.services.bundler import create_deployment_kit
+from app.services import completeness
+from app.services.completeness import (
+    INFRASTRUCTURE_PATTERNS,
+    count_resources,
+    count_total_resources,
+    detect_infrastructure_pattern,
+    tally_resources,
+)
+from app.services.bundler import (
+    KIT_MODES,
+    build_deployment_kit,
+    build_deployment_tarball,
+    create_deployment_kit,
+    stream_deployment_kit,
+    zstandard,
+)
 
 print("=" * 70)
 print("InfraGenie Phase 1.3 - Self-Test")
@@ -290,6 +310,176 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 
+print()
+
+# Test 4: Kit Modes and Formats
+print("🧪 Test 4: Kit Modes and Archive Formats")
+print("-" * 70)
+
+try:
+    KIT_FILES = {"main.tf", "playbook.yml", "deploy.sh", "destroy.sh", "README.md", "inventory.ini"}
+    
+    def check_zip(kit: bytes, label: str) -> Dict[str, bytes]:
+        """Verify a ZIP kit's CRCs and members; return member contents (README aside)."""
+        with zipfile.ZipFile(io.BytesIO(kit), 'r') as zf:
+            bad_member = zf.testzip()
+            assert bad_member is None, f"{label}: corrupt member {bad_member}"
+            assert set(zf.namelist()) == KIT_FILES, f"{label}: members {zf.namelist()}"
+            unix_mode = (zf.getinfo("deploy.sh").external_attr >> 16) & 0o777
+            assert unix_mode == 0o755, f"{label}: deploy.sh mode {oct(unix_mode)}"
+            return {name: zf.read(name) for name in KIT_FILES if name != "README.md"}
+    
+    # Buffered kits start from the static-members skeleton, streamed kits are
+    # written member by member; both must hold the same files
+    reference = check_zip(build_deployment_kit(mock_state), "fast (buffered)")
+    
+    for mode in KIT_MODES:
+        members = check_zip(build_deployment_kit(mock_state, mode=mode), f"{mode} (buffered)")
+        assert members == reference, f"{mode} (buffered): contents differ"
+        streamed = b"".join(stream_deployment_kit(mock_state, mode=mode))
+        members = check_zip(streamed, f"{mode} (streamed)")
+        assert members == reference, f"{mode} (streamed): contents differ"
+        print(f"✅ Mode '{mode}': buffered and streamed ZIPs pass testzip()")
+    
+    members = check_zip(build_deployment_kit(mock_state, compression=zipfile.ZIP_STORED), "stored")
+    assert members == reference, "stored: contents differ"
+    print("✅ Stored ZIP (zstd transport) passes testzip()")
+    
+    if zstandard is not None:
+        tarball = zstandard.ZstdDecompressor().decompress(build_deployment_tarball(mock_state))
+        with tarfile.open(fileobj=io.BytesIO(tarball), mode="r:") as tf:
+            assert set(tf.getnames()) == KIT_FILES, f"tar.zst: members {tf.getnames()}"
+            for name, data in reference.items():
+                assert tf.extractfile(name).read() == data, f"tar.zst: {name} differs"
+            assert tf.getmember("deploy.sh").mode & 0o777 == 0o755, "tar.zst: deploy.sh not executable"
+        print("✅ tar.zst kit unpacks with the same members")
+    else:
+        print("ℹ️  zstandard not installed - tar.zst kit not checked")
+    
+    print()
+    print("✅ Test 4 PASSED: All kit modes and formats round-trip")
+    
+except Exception as e:
+    print(f"❌ Test 4 FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+print()
+
+# Test 5: Completeness Resource Tally
+print("🧪 Test 5: Completeness Resource Tally")
+print("-" * 70)
+
+try:
+    def reference_count(code: str, resource_type: str) -> int:
+        """Per-type regex scan the single-pass tally replaced."""
+        if '|' in resource_type:
+            pattern = rf'resource\s+"({resource_type})"\s+"'
+        else:
+            pattern = rf'resource\s+"{re.escape(resource_type)}"\s+"'
+        return len(re.findall(pattern, code))
+    
+    def reference_total(code: str) -> int:
+        """Complete resource blocks, as the total count always measured them."""
+        return len(re.findall(r'resource\s+"[^"]+"\s+"[^"]+"\s*{', code))
+    
+    # Mixed aws_lb/aws_alb, prefix-sharing types (aws_lb_listener), a header
+    # without its brace, and a brace on the next line
+    MIXED_LB_CODE = """
+provider "aws" { region = "us-east-1" }
+resource "aws_lb" "public" {
+  load_balancer_type = "application"
+}
+resource "aws_alb" "legacy" {}
+resource  "aws_lb"   "internal"
+{
+}
+resource "aws_lb_target_group" "web" {}
+resource "aws_lb_listener" "http" {}
+resource "aws_lb_listener" "https" {}
+resource "aws_security_group" "lb" {}
+resource "aws_vpc" "main"
+"""
+    counts, total = tally_resources(MIXED_LB_CODE)
+    for resource_type in ("aws_lb|aws_alb", "aws_lb", "aws_alb", "aws_lb_listener",
+                          "aws_lb_target_group", "aws_vpc", "aws_instance"):
+        expected = reference_count(MIXED_LB_CODE, resource_type)
+        assert count_resources(MIXED_LB_CODE, resource_type) == expected, f"count_resources({resource_type})"
+        assert sum(counts[t] for t in resource_type.split("|")) == expected, f"tally[{resource_type}]"
+        print(f"✅ {resource_type:22s} {expected} (matches per-type scan)")
+    
+    expected_total = reference_total(MIXED_LB_CODE)
+    assert total == expected_total, f"tally total {total} != {expected_total}"
+    assert count_total_resources(MIXED_LB_CODE) == expected_total, "count_total_resources"
+    print(f"✅ Total resource blocks: {expected_total} (header without a brace excluded)")
+    
+    print()
+    print("✅ Test 5 PASSED: Resource tally matches per-type counting")
+    
+except Exception as e:
+    print(f"❌ Test 5 FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+print()
+
+# Test 6: Infrastructure Pattern Detection
+print("🧪 Test 6: Infrastructure Pattern Detection")
+print("-" * 70)
+
+try:
+    def reference_pattern(user_prompt: str):
+        """Pattern x keyword loop over the source table, in declaration order."""
+        prompt_lower = user_prompt.lower()
+        for pattern_name, pattern_def in INFRASTRUCTURE_PATTERNS.items():
+            for keyword in pattern_def["keywords"]:
+                if keyword in prompt_lower:
+                    return pattern_name
+        return None
+    
+    # Several prompts match more than one pattern, some with the lower
+    # precedence keyword first in the text
+    DETECTION_PROMPTS = [
+        "Create an EC2 instance",
+        "Create a Kubernetes cluster",
+        "Deploy K8S on AWS",
+        "Docker containers on a kubernetes cluster",
+        "A postgres database behind an application load balancer",
+        "Nginx web server in a docker container",
+        "Put an ALB in front of my ECS Fargate service",
+        "Load Balancer for a MySQL DB cluster",
+        "Static site with an S3 bucket",
+    ]
+    
+    automaton = completeness._KEYWORD_AUTOMATON
+    scans = [("keyword loop", None)]
+    if automaton is not None:
+        scans.append(("Aho-Corasick", automaton))
+    else:
+        print("ℹ️  pyahocorasick not installed - checking the fallback loop only")
+    
+    try:
+        for label, scan_automaton in scans:
+            completeness._KEYWORD_AUTOMATON = scan_automaton
+            for user_prompt in DETECTION_PROMPTS:
+                expected = reference_pattern(user_prompt)
+                detected = detect_infrastructure_pattern(user_prompt)
+                assert detected == expected, f"{label}: {user_prompt!r} -> {detected}, expected {expected}"
+            print(f"✅ {label}: {len(DETECTION_PROMPTS)} prompts match the reference loop")
+    finally:
+        completeness._KEYWORD_AUTOMATON = automaton
+    
+    print()
+    print("✅ Test 6 PASSED: Pattern detection preserves precedence")
+    
+except Exception as e:
+    print(f"❌ Test 6 FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
 print()
 print("=" * 70)
 print("✅ ALL TESTS PASSED - Phase 1.3 Self-Test Complete")
@@ -301,6 +491,9 @@ print(f"  ✓ State structure validated")
 print(f"  ✓ Cost Assassin feature present")
 print(f"  ✓ ZIP contains all required files")
 print(f"  ✓ File permissions correct")
+print(f"  ✓ Kit modes and formats round-trip")
+print(f"  ✓ Completeness resource tally consistent")
+print(f"  ✓ Pattern detection precedence preserved")
 print()
 print("Next Steps:")
 print("  1. Build Docker image: docker build -t infragenie-backend .")
@@ -6,9 +6,41 @@ This requires GROQ_API_KEY to be set
 
 import sys
 import os
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
+
+@contextmanager
+def stubbed_sandbox(validation_error=None, violations=()):
+    """Replace the sandbox tools used by validator_node with canned results."""
+    from app.core import graph
+    
+    async def validate(code, workspace=None):
+        return validation_error
+    
+    async def scan(code, workspace=None):
+        return list(violations)
+    
+    stubs = {
+        "validate_terraform": validate,
+        "run_checkov": scan,
+        "terraform_workspace": lambda code: nullcontext("/tmp/infragenie-test"),
+    }
+    originals = {name: getattr(graph, name) for name in stubs}
+    for name, stub in stubs.items():
+        setattr(graph, name, stub)
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(graph, name, original)
+
+
 def test_simple_ec2_workflow():
     """Test complete workflow with a simple EC2 request"""
     print("\n" + "="*70)
@@ -107,8 +139,8 @@ def test_workflow_components():
                 print(f"  ✓ Graph has {len(nodes)} nodes")
                 
                 expected_nodes = ['clarifier', 'planner', 'architect', 'validator', 
-                                'completeness_validator', 'validate_deep', 'security',
-                                'parser', 'finops', 'ansible']
+                                'validate_deep', 'security', 'post_security',
+                                'ansible', 'retry_backoff']
                 
                 found_nodes = []
                 for node in expected_nodes:
@@ -131,6 +163,365 @@ def test_workflow_components():
         return False
 
 
+def test_single_flight():
+    """Test that concurrent identical LLM calls are coalesced into one"""
+    print("\n" + "="*70)
+    print("INTEGRATION TEST: Single-Flight LLM Call Deduplication")
+    print("="*70)
+    
+    try:
+        from app.core.singleflight import SingleFlight, make_key
+        
+        flight = SingleFlight()
+        key = make_key("architect", "standard", "Create an EC2 instance")
+        waiters = 8
+        
+        def run_callers(fn):
+            """Start a leader, let followers join while it runs, collect outcomes."""
+            outcomes = [None] * waiters
+            
+            def caller(index):
+                try:
+                    outcomes[index] = ("ok", flight.do(key, fn))
+                except Exception as e:
+                    outcomes[index] = ("error", e)
+            
+            threads = [threading.Thread(target=caller, args=(i,)) for i in range(waiters)]
+            threads[0].start()
+            started.wait(timeout=5)
+            for thread in threads[1:]:
+                thread.start()
+            time.sleep(0.2)  # Followers find the in-flight call and block on it
+            release.set()
+            for thread in threads:
+                thread.join(timeout=5)
+            return outcomes
+        
+        # Concurrent identical calls: one execution, one shared result
+        calls = []
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_call():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return {"content": "resource \"aws_instance\" \"web\" {}"}
+        
+        outcomes = run_callers(slow_call)
+        results = [value for status, value in outcomes]
+        assert len(calls) == 1, f"expected 1 execution, got {len(calls)}"
+        assert all(status == "ok" for status, _ in outcomes), f"unexpected outcomes: {outcomes}"
+        assert all(result is results[0] for result in results), "callers received different results"
+        print(f"  ✓ {waiters} concurrent callers, 1 execution, shared result")
+        
+        # A failing call raises the same exception in every waiting caller
+        calls.clear()
+        started, release = threading.Event(), threading.Event()
+        
+        def failing_call():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            raise RuntimeError("Groq rate limit exceeded")
+        
+        outcomes = run_callers(failing_call)
+        assert len(calls) == 1, f"expected 1 execution, got {len(calls)}"
+        assert all(status == "error" and str(value) == "Groq rate limit exceeded"
+                   for status, value in outcomes), f"unexpected outcomes: {outcomes}"
+        print(f"  ✓ Exception propagated to all {waiters} callers")
+        
+        # The key is released once the leader finishes: the next call runs again
+        assert flight.do(key, lambda: "fresh") == "fresh", "finished call was served stale"
+        print("  ✓ Key released after completion (no stale results)")
+        
+        print(f"\n✅ Single-flight deduplication working")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Single-flight test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_sse_log_events_once():
+    """Test that the SSE stream forwards every log line exactly once"""
+    print("\n" + "="*70)
+    print("INTEGRATION TEST: SSE Log Events (no replay from the END chunk)")
+    print("="*70)
+    
+    try:
+        from langgraph.graph import END
+        from app.core import graph
+        from app.main import _stream_test_generate
+        
+        node_updates = [
+            {"clarifier": {"logs": ["🔍 Clarifier: request is specific enough"]}},
+            {"planner": {"logs": ["📋 Planner: 3 resources planned"]}},
+            {"architect": {
+                "terraform_code": 'resource "aws_instance" "web" {}',
+                "retry_count": 1,
+                "attempt_signatures": ["sig-1"],
+                "logs": ["🏗️ Architect: generated Terraform"]
+            }},
+            {"validator": {"is_clean": True, "logs": ["✅ Terraform validation passed"]}},
+        ]
+        expected_logs = [m for chunk in node_updates for update in chunk.values() for m in update["logs"]]
+        
+        class FakeWorkflowApp:
+            """Replays node updates, then the pinned LangGraph's {END: full state} chunk."""
+            async def astream(self, state, config=None):
+                for chunk in node_updates:
+                    yield chunk
+                final = dict(state)
+                for chunk in node_updates:
+                    final.update(next(iter(chunk.values())))
+                final["logs"] = list(expected_logs)
+                final["attempt_signatures"] = ["sig-1"]
+                yield {END: final}
+        
+        async def collect():
+            return [frame async for frame in _stream_test_generate("Create an EC2 instance")]
+        
+        original = graph.get_workflow_app
+        graph.get_workflow_app = lambda: FakeWorkflowApp()
+        try:
+            frames = asyncio.run(collect())
+        finally:
+            graph.get_workflow_app = original
+        
+        events = []
+        for frame in frames:
+            event_line, data_line = frame.strip().split("\n")
+            events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+        
+        log_events = [data for event, data in events if event == "log"]
+        messages = [data["message"] for data in log_events]
+        assert messages == expected_logs, f"log events {messages} != {expected_logs}"
+        assert all(data["node"] != END for data in log_events), "logs replayed from the END chunk"
+        print(f"  ✓ {len(expected_logs)} log lines, each sent exactly once")
+        
+        assert [event for event, _ in events].count("done") == 1, "expected one done event"
+        done = events[-1]
+        assert done[0] == "done" and done[1]["is_clean"] and done[1]["retry_count"] == 1, f"bad done event: {done}"
+        print("  ✓ Single done event carries the final state")
+        
+        print(f"\n✅ SSE log streaming working")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ SSE log streaming test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_retry_loop_early_exit():
+    """Test that repeated failed attempts and empty code end the workflow"""
+    print("\n" + "="*70)
+    print("INTEGRATION TEST: Architect Retry Loop Early Exit")
+    print("="*70)
+    
+    try:
+        from app.core import graph
+        
+        error = "Error: Unsupported argument \"instance_typ\""
+        
+        def run_attempts(codes):
+            """Validate each generated code in turn, merging updates like the graph does."""
+            state = {"user_prompt": "Create an EC2 instance", "attempt_signatures": []}
+            for retry_count, code in enumerate(codes, start=1):
+                state.update(terraform_code=code, retry_count=retry_count)
+                update = asyncio.run(graph.validator_node(state))
+                state["validation_error"] = update["validation_error"]
+                state["attempt_signatures"] = state["attempt_signatures"] + update["attempt_signatures"]
+            return graph.route_from_validator(state)
+        
+        with stubbed_sandbox(validation_error=error):
+            first = 'resource "aws_instance" "web" { instance_typ = "t3.micro" }'
+            second = 'resource "aws_instance" "web" { instance_typ = "t3.small" }'
+            
+            assert run_attempts([first]) == "architect", "first failure should retry"
+            assert run_attempts([first, second]) == "architect", "a new attempt should retry"
+            print("  ✓ New failed attempts are retried")
+            
+            assert run_attempts([first, first]) == "end", "identical attempt should end the run"
+            print("  ✓ Same code and error twice in a row ends the run")
+        
+        assert graph.route_after_architect({"terraform_code": ""}) == "end", "empty code should end the run"
+        assert graph.route_after_architect({"terraform_code": first}) == "validator"
+        print("  ✓ Empty architect output goes straight to END")
+        
+        print(f"\n✅ Retry loop early exit working")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Retry loop early exit test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_model_router():
+    """Test that the model router picks tiers from retry state and observed outcomes"""
+    print("\n" + "="*70)
+    print("INTEGRATION TEST: Model Router Tier Selection")
+    print("="*70)
+    
+    try:
+        from app.core import model_config
+        from app.core.model_config import ModelTier, get_model_for_task, record_llm_result
+        
+        def state(retry_count):
+            return {"user_prompt": "Create an EC2 instance", "retry_count": retry_count}
+        
+        # Start from the default statistics, whatever earlier runs recorded
+        saved_stats = dict(model_config._router_stats)
+        model_config._router_stats.clear()
+        try:
+            assert get_model_for_task("architect") == ModelTier.STANDARD
+            assert get_model_for_task("architect", state(0)) == ModelTier.STANDARD
+            print("  ✓ First attempt uses the task's default tier")
+            
+            tier = get_model_for_task("architect", state(2))
+            assert tier == ModelTier.LIGHTWEIGHT, f"expected lightweight on retry 2, got {tier}"
+            print("  ✓ Second retry drops the architect to the lightweight tier")
+            
+            for _ in range(10):
+                record_llm_result("architect", ModelTier.LIGHTWEIGHT, success=False)
+            tier = get_model_for_task("architect", state(2))
+            assert tier == ModelTier.STANDARD, f"expected standard after failures, got {tier}"
+            print("  ✓ Repeated lightweight failures route the retry back to standard")
+        finally:
+            model_config._router_stats.clear()
+            model_config._router_stats.update(saved_stats)
+        
+        print(f"\n✅ Model router working")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Model router test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_validator_merge():
+    """Test that the validator merges syntax, completeness and security results"""
+    print("\n" + "="*70)
+    print("INTEGRATION TEST: Validator Result Merge")
+    print("="*70)
+    
+    try:
+        from app.core import graph
+        
+        violation = {
+            "check_id": "CKV_AWS_79",
+            "check_name": "Ensure Instance Metadata Service Version 1 is not enabled",
+            "resource": "aws_instance.web",
+        }
+        vpc_only = 'resource "aws_vpc" "main" { cidr_block = "10.0.0.0/16" }'
+        instance = 'resource "aws_instance" "web" { instance_type = "t3.micro" }'
+        
+        def validate(prompt, code):
+            return asyncio.run(graph.validator_node({"user_prompt": prompt, "terraform_code": code}))
+        
+        with stubbed_sandbox(violations=[violation]):
+            update = validate("Create a Kubernetes cluster", vpc_only)
+        assert update["validation_error"].startswith("Missing required components"), update["validation_error"]
+        assert update["completion_advice"] and "EKS cluster" in update["missing_components"]
+        assert update["infrastructure_type"] == "complex" and update["completeness_score"] < 1.0
+        assert update["security_violations"] == [violation], "Checkov results dropped from the merge"
+        assert update["logs"][0] == "✅ Terraform syntax validation passed"
+        assert update["logs"][1].startswith("❌ Completeness check failed")
+        print("  ✓ Incomplete code: completeness error, advice and Checkov results merged")
+        
+        with stubbed_sandbox(violations=[violation]):
+            update = validate("Create an EC2 instance", instance)
+        assert update["validation_error"] is None and update["completeness_score"] == 1.0
+        assert update["security_violations"] == [violation]
+        print("  ✓ Complete code: no validation error, violations kept for the security node")
+        
+        with stubbed_sandbox(validation_error="Error: Invalid block definition", violations=[violation]):
+            update = validate("Create a Kubernetes cluster", vpc_only)
+        assert update["validation_error"] == "Error: Invalid block definition"
+        assert "completeness_score" not in update and "security_violations" not in update
+        print("  ✓ Syntax error wins and discards completeness and scan results")
+        
+        print(f"\n✅ Validator merge working")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Validator merge test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_post_security_memo():
+    """Test that parser and FinOps results are reused for unchanged code"""
+    print("\n" + "="*70)
+    print("INTEGRATION TEST: Parser/FinOps Memoization")
+    print("="*70)
+    
+    try:
+        from app.core import graph
+        from app.services import parser
+        
+        calls = {"parse": 0, "cost": 0}
+        estimates = ["Unable to estimate (Infracost unavailable)", "$8.47/mo"]
+        
+        def parse(code):
+            calls["parse"] += 1
+            return {"nodes": [{"id": "aws_instance.web"}], "edges": []}
+        
+        def cost(code):
+            calls["cost"] += 1
+            return estimates[min(calls["cost"], len(estimates)) - 1]
+        
+        def run(code):
+            return asyncio.run(graph.post_security_node({"terraform_code": code}))
+        
+        originals = (parser.parse_hcl_to_graph, graph.get_cost_estimate)
+        saved_caches = (dict(graph._parse_cache), dict(graph._cost_cache))
+        parser.parse_hcl_to_graph, graph.get_cost_estimate = parse, cost
+        graph._parse_cache.clear()
+        graph._cost_cache.clear()
+        try:
+            code = 'resource "aws_instance" "web" { instance_type = "t3.micro" }'
+            
+            first = run(code)
+            assert first["cost_estimate"].startswith("Unable"), first
+            second = run(code)
+            assert calls == {"parse": 1, "cost": 2}, f"unexpected calls: {calls}"
+            assert second["graph_data"] == first["graph_data"] and second["cost_estimate"] == "$8.47/mo"
+            print("  ✓ Unchanged code is parsed once; failed estimates are retried")
+            
+            third = run(code)
+            assert calls == {"parse": 1, "cost": 2}, f"unexpected calls: {calls}"
+            assert third == second, "memoized results differ"
+            print("  ✓ Unchanged code reuses the graph and the cost estimate")
+            
+            run(code + "\n# changed")
+            assert calls == {"parse": 2, "cost": 3}, f"unexpected calls: {calls}"
+            print("  ✓ Changed code is parsed and costed again")
+        finally:
+            parser.parse_hcl_to_graph, graph.get_cost_estimate = originals
+            graph._parse_cache.clear()
+            graph._parse_cache.update(saved_caches[0])
+            graph._cost_cache.clear()
+            graph._cost_cache.update(saved_caches[1])
+        
+        print(f"\n✅ Parser/FinOps memoization working")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Parser/FinOps memoization test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def run_integration_tests():
     """Run all integration tests"""
     print("\n" + "="*70)
@@ -139,6 +530,12 @@ def run_integration_tests():
     
     results = {
         'Workflow Components': test_workflow_components(),
+        'Single-Flight Deduplication': test_single_flight(),
+        'SSE Log Events': test_sse_log_events_once(),
+        'Retry Loop Early Exit': test_retry_loop_early_exit(),
+        'Model Router': test_model_router(),
+        'Validator Merge': test_validator_merge(),
+        'Parser/FinOps Memoization': test_post_security_memo(),
     }
     
     # Only run actual workflow test if API key is present